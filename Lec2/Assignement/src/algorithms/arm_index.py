@@ -0,0 +1,166 @@
+import heapq
+import math
+import numpy as np
+
+class ArgmaxTree:
+    """
+    Tournament tree keeping the argmax of an array under single-element updates
+    
+    Every internal node stores the index of the larger of its two children,
+    so argmax() is O(1) and update() replays one leaf-to-root path, O(log K).
+    Ties go to the lower index, matching np.argmax.
+    """
+    def __init__(self, values: np.ndarray):
+        n = len(values)
+        self.size = 1 << max(0, (n - 1).bit_length())
+        padded = np.full(self.size, -np.inf)
+        padded[:n] = values
+        
+        # Build bottom-up: winner[node] is the index of the max leaf below node
+        winner = np.zeros(2 * self.size, dtype=np.int64)
+        winner[self.size:] = np.arange(self.size)
+        level = self.size
+        while level > 1:
+            left = winner[level:2 * level:2]
+            right = winner[level + 1:2 * level:2]
+            winner[level // 2:level] = np.where(padded[left] >= padded[right], left, right)
+            level //= 2
+        
+        # Plain lists index much faster than numpy arrays from Python
+        self.values = padded.tolist()
+        self.winner = winner.tolist()
+    
+    def update(self, i: int, value: float):
+        """Set values[i] = value and repair the path to the root"""
+        values, winner = self.values, self.winner
+        values[i] = value
+        node = (i + self.size) >> 1
+        while node:
+            left, right = winner[2 * node], winner[2 * node + 1]
+            winner[node] = left if values[left] >= values[right] else right
+            node >>= 1
+    
+    def argmax(self) -> int:
+        """Index of the largest value"""
+        return self.winner[1]
+
+class UCBIndex:
+    """
+    Lazily-invalidated heaps over UCB scores
+    
+    For arms with the same pull count n the UCB ranking is the ranking of the
+    estimates, so arms are grouped by n, each group keeping a max-heap of
+    estimates. Only the group leaders compete on the full score
+    estimate + c * sqrt(log N / n), and there are far fewer distinct pull
+    counts than arms.
+    
+    Leader scores grow with log(total pulls) N, so the leader heap is keyed by
+    upper bounds: the score at a horizon N_max that is doubled (with a rebuild
+    of the small leader heap) once N passes it. To select, leaders are popped
+    in bound order and scored exactly until the best score beats every
+    remaining bound. Pulls push fresh entries; outdated ones are skipped when
+    they surface and periodically compacted away.
+    
+    Decisions match the vectorized rule (unpulled arms first, lowest index;
+    then the highest score, ties to the lower index).
+    """
+    def __init__(self, estimates: np.ndarray, pulls: np.ndarray, c: float):
+        # Arrays are shared with the algorithm, not copied
+        self.estimates = estimates
+        self.pulls = pulls
+        self.c = c
+        self._next_unpulled = 0
+        self._rebuild_groups()
+        self._rebuild_leaders(max(2, 2 * int(pulls.sum())))
+    
+    def _rebuild_groups(self):
+        """Rebuild every per-pull-count heap from the algorithm's arrays"""
+        self._versions = [0] * len(self.pulls)
+        self._groups = {}
+        pulled = np.flatnonzero(self.pulls)
+        for n in np.unique(self.pulls[pulled]).tolist():
+            arms = pulled[self.pulls[pulled] == n]
+            group = list(zip((-self.estimates[arms]).tolist(), arms.tolist(), [0] * len(arms)))
+            heapq.heapify(group)
+            self._groups[n] = group
+        self._n_entries = len(pulled)
+    
+    def _leader(self, n: int):
+        """Current (estimate, arm) leader of group n, or None if it is empty"""
+        group = self._groups.get(n)
+        while group:
+            neg_estimate, arm, version = group[0]
+            if version == self._versions[arm]:
+                return -neg_estimate, arm
+            heapq.heappop(group)
+            self._n_entries -= 1
+        self._groups.pop(n, None)
+        return None
+    
+    def _push_leader(self, n: int):
+        """Key group n in the leader heap by its bound at the horizon"""
+        leader = self._leader(n)
+        self._leader_versions[n] = self._leader_versions.get(n, 0) + 1
+        if leader is not None:
+            estimate, arm = leader
+            bound = estimate + self.c * math.sqrt(self._log_horizon / n)
+            heapq.heappush(self._leaders, (-bound, n, self._leader_versions[n], estimate, arm))
+    
+    def _rebuild_leaders(self, horizon: int):
+        """Recompute every leader bound for a new horizon"""
+        self.horizon = horizon
+        self._log_horizon = math.log(horizon)
+        self._leaders = []
+        self._leader_versions = {}
+        for n in list(self._groups):
+            self._push_leader(n)
+    
+    def update(self, arm: int, n_added: int = 1):
+        """Refresh arm's entries after it was pulled n_added more times"""
+        n = int(self.pulls[arm])
+        self._versions[arm] += 1
+        heapq.heappush(self._groups.setdefault(n, []), (-self.estimates[arm], arm, self._versions[arm]))
+        self._n_entries += 1
+        # The arm left group n - n_added and joined group n; both leaders may change
+        if n > n_added:
+            self._push_leader(n - n_added)
+        self._push_leader(n)
+        
+        # Outdated entries only cost memory; compact when they dominate
+        if self._n_entries > 4 * len(self.pulls):
+            self._rebuild_groups()
+            self._rebuild_leaders(self.horizon)
+        elif len(self._leaders) > 4 * len(self._groups) + 64:
+            self._rebuild_leaders(self.horizon)
+    
+    def select(self, total_pulls: int) -> int:
+        """Arm with the highest UCB score given total_pulls"""
+        pulls = self.pulls
+        while self._next_unpulled < len(pulls) and pulls[self._next_unpulled] > 0:
+            self._next_unpulled += 1
+        if self._next_unpulled < len(pulls):
+            return self._next_unpulled
+        
+        if total_pulls > self.horizon:
+            self._rebuild_leaders(2 * total_pulls)
+        
+        log_total = math.log(total_pulls)
+        leaders, versions = self._leaders, self._leader_versions
+        best_arm, best_value = -1, -math.inf
+        popped = []
+        while leaders:
+            neg_bound, n, version, estimate, arm = leaders[0]
+            if version != versions.get(n):
+                heapq.heappop(leaders)
+                continue
+            if -neg_bound < best_value:
+                break
+            popped.append(heapq.heappop(leaders))
+            value = estimate + self.c * math.sqrt(log_total / n)
+            if value > best_value or (value == best_value and arm < best_arm):
+                best_arm, best_value = arm, value
+        
+        # Bounds of the inspected leaders are still valid upper bounds
+        for entry in popped:
+            heapq.heappush(leaders, entry)
+        return best_arm
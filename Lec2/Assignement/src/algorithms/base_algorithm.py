@@ -1,17 +1,36 @@
 from abc import ABC, abstractmethod
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 from environment.mab_environment import MABEnvironment
+from algorithms.estimators import SlidingWindowEstimator, DiscountedEstimator
 
 class BaseMABAlgorithm(ABC):
     """
     Base class for all MAB algorithms
     """
-    def __init__(self, n_arms: int, **kwargs):
+    def __init__(self, n_arms: int, rng: np.random.Generator = None, seed: int = None,
+                 estimator: Union[SlidingWindowEstimator, DiscountedEstimator] = None, **kwargs):
+        """
+        Args:
+            n_arms: Number of arms
+            rng: Private random generator (built from seed if None)
+            seed: Random seed, used when rng is None
+            estimator: Non-stationary estimator providing self.estimates
+                (SlidingWindowEstimator or DiscountedEstimator). If None,
+                estimates are sample means over all pulls
+        """
         self.n_arms = n_arms
+        self.rng = rng if rng is not None else np.random.default_rng(seed)  # Private random stream
+        self.estimator = estimator
         self.pulls = np.zeros(n_arms, dtype=int)  # Number of times each arm pulled
         self.rewards = np.zeros(n_arms)  # Cumulative rewards for each arm
         self.estimates = np.zeros(n_arms)  # Current estimates of expected rewards
+        self.total_pulls = 0  # Total number of pulls across all arms
+        self.cumulative_regret = 0.0  # Running regret, see track_regret
+        self._regret_gaps = None
+        if estimator is not None:
+            estimator.reset(n_arms)
+            self.estimates = estimator.estimates
         
     @abstractmethod
     def select_arm(self) -> int:
@@ -33,22 +52,269 @@ class BaseMABAlgorithm(ABC):
         """
         self.pulls[arm] += 1
         self.rewards[arm] += reward
+        self.total_pulls += 1
+        
+        # Update estimate (sample mean unless a non-stationary estimator is set)
+        if self.estimator is not None:
+            self.estimator.update(arm, reward)
+        else:
+            self.estimates[arm] = self.rewards[arm] / self.pulls[arm]
+        
+        if self._regret_gaps is not None:
+            self.cumulative_regret += self._regret_gaps[arm]
+    
+    def ingest(self, arms: np.ndarray, rewards: np.ndarray):
+        """
+        Apply many delayed observations at once
+        
+        Equivalent to calling update(arm, reward) for every pair, but the
+        observations are aggregated per arm first, so pulls, rewards and
+        estimates are touched once per distinct arm. A non-stationary
+        estimator still sees the observations one by one, in order.
+        
+        Args:
+            arms: Array of pulled arms (repeats allowed)
+            rewards: Array with the reward observed for each entry of arms
+        """
+        arms = np.asarray(arms, dtype=int).ravel()
+        rewards = np.asarray(rewards, dtype=float).ravel()
+        if len(arms) != len(rewards):
+            raise ValueError(f"Got {len(rewards)} rewards for {len(arms)} arms")
+        if len(arms) == 0:
+            return
+        if arms.min() < 0 or arms.max() >= self.n_arms:
+            raise ValueError(f"Invalid arms in batch. Must be 0 <= arm < {self.n_arms}")
+            
+        # Aggregate per distinct arm (cost independent of n_arms)
+        touched, inverse = np.unique(arms, return_inverse=True)
+        counts = np.bincount(inverse)
+        sums = np.bincount(inverse, weights=rewards)
+        
+        self.pulls[touched] += counts
+        self.rewards[touched] += sums
+        self.total_pulls += len(arms)
+        if self.estimator is not None:
+            # Windows and discounts depend on arrival order
+            for arm, reward in zip(arms.tolist(), rewards.tolist()):
+                self.estimator.update(arm, reward)
+        else:
+            self.estimates[touched] = self.rewards[touched] / self.pulls[touched]
+        
+        if self._regret_gaps is not None:
+            self.cumulative_regret += float(counts @ self._regret_gaps[touched])
+        self._after_bulk_update(touched, counts)
+    
+    def _after_bulk_update(self, arms: np.ndarray, counts: np.ndarray):
+        """
+        Hook run after pulls/rewards/estimates changed outside update()
+        
+        Subclasses keeping derived state (e.g. selection indexes) refresh it
+        here. Called by ingest() and by the compiled kernel.
+        
+        Args:
+            arms: Arms whose state changed
+            counts: Number of pulls added to each of them
+        """
+        pass
+    
+    def select_arms(self, n: int) -> np.ndarray:
+        """
+        Make n decisions at once from the current (shared) state
+        
+        Used to answer concurrent requests against one algorithm without
+        updates in between. Subclasses should override this with a vectorized
+        rule; the default calls select_arm() n times.
+        
+        Args:
+            n: Number of decisions
+            
+        Returns:
+            Array of n selected arms
+        """
+        return np.array([self.select_arm() for _ in range(n)], dtype=int)
+    
+    def effective_pulls(self) -> np.ndarray:
+        """Per-arm pull counts the estimates are based on (windowed or discounted with an estimator)"""
+        if self.estimator is not None:
+            return self.estimator.effective_pulls()
+        return self.pulls
+    
+    def effective_total(self) -> float:
+        """Total pull count the estimates are based on"""
+        if self.estimator is not None:
+            return self.estimator.effective_total()
+        return self.total_pulls
+    
+    def track_regret(self, environment: MABEnvironment):
+        """
+        Keep a running regret total against an environment
+        
+        Once enabled, update() and update_batch() add the environment's cached
+        gap for every pull, so get_cumulative_regret() is O(1).
+        
+        Args:
+            environment: Environment whose gap vector is used
+        """
+        self._regret_gaps = environment.gaps
+    
+    def reset_batch(self, n_runs: int):
+        """
+        Allocate state for a batch of independent runs
+        
+        Each run owns one row of the (n_runs, n_arms) batch arrays, so a whole
+        batch can be advanced with a single vectorized select/update per step.
+        
+        Args:
+            n_runs: Number of independent runs
+        """
+        if self.estimator is not None:
+            raise ValueError("Batched runs only support sample-mean estimates (estimator=None)")
+        self.n_runs = n_runs
+        self.batch_pulls = np.zeros((n_runs, self.n_arms), dtype=int)
+        self.batch_rewards = np.zeros((n_runs, self.n_arms))
+        self.batch_estimates = np.zeros((n_runs, self.n_arms))
+        self.batch_cumulative_regret = np.zeros(n_runs)
+    
+    def _batch_agents(self, agents: np.ndarray = None) -> np.ndarray:
+        """Row indices addressed by a batch call (all runs if agents is None)"""
+        if agents is None:
+            return np.arange(self.n_runs)
+        return np.asarray(agents, dtype=int)
+    
+    def select_arm_batch(self, agents: np.ndarray = None) -> np.ndarray:
+        """
+        Select an arm for many independent runs (agents) at once
         
-        # Update estimate (sample mean)
-        self.estimates[arm] = self.rewards[arm] / self.pulls[arm]
+        Subclasses should override this with a vectorized rule. The default
+        falls back to calling select_arm() once per run on that run's row.
+        
+        Args:
+            agents: Row indices of the runs to select for (all runs if None)
+            
+        Returns:
+            Array with the arm selected by each requested run
+        """
+        agents = self._batch_agents(agents)
+        arms = np.empty(len(agents), dtype=int)
+        pulls, rewards, estimates, total_pulls = self.pulls, self.rewards, self.estimates, self.total_pulls
+        try:
+            for i, run in enumerate(agents):
+                self.pulls = self.batch_pulls[run]
+                self.rewards = self.batch_rewards[run]
+                self.estimates = self.batch_estimates[run]
+                self.total_pulls = int(self.pulls.sum())
+                arms[i] = self.select_arm()
+        finally:
+            self.pulls, self.rewards, self.estimates, self.total_pulls = pulls, rewards, estimates, total_pulls
+        return arms
+    
+    def update_batch(self, arms: np.ndarray, rewards: np.ndarray, agents: np.ndarray = None):
+        """
+        Update many independent runs (agents) with their observed rewards
+        
+        Args:
+            arms: Array with the arm pulled by each run
+            rewards: Array with the reward observed by each run
+            agents: Row index of the run each observation belongs to. If None,
+                arms and rewards hold exactly one observation per run. Runs may
+                appear more than once.
+        """
+        arms = np.asarray(arms, dtype=int)
+        if agents is None:
+            agents = np.arange(self.n_runs)
+            self.batch_pulls[agents, arms] += 1
+            self.batch_rewards[agents, arms] += rewards
+        else:
+            agents = np.asarray(agents, dtype=int)
+            # np.add.at accumulates repeated (agent, arm) pairs correctly
+            np.add.at(self.batch_pulls, (agents, arms), 1)
+            np.add.at(self.batch_rewards, (agents, arms), rewards)
+        self.batch_estimates[agents, arms] = self.batch_rewards[agents, arms] / self.batch_pulls[agents, arms]
+        
+        if self._regret_gaps is not None:
+            np.add.at(self.batch_cumulative_regret, agents, self._regret_gaps[arms])
     
     def get_estimated_optimal_arm(self) -> int:
         """Get arm with highest estimated reward"""
         return np.argmax(self.estimates)
     
-    def get_cumulative_regret(self, environment: MABEnvironment, history: List[int]) -> float:
-        """Calculate cumulative regret"""
-        optimal_reward = environment.get_optimal_reward()
-        cumulative_reward = sum(environment.true_expected_rewards[arm] for arm in history)
-        return optimal_reward * len(history) - cumulative_reward
+    def get_cumulative_regret(self, environment: MABEnvironment, history: List[int] = None) -> float:
+        """
+        Calculate cumulative regret
+        
+        Args:
+            environment: Environment the arms were pulled in
+            history: Arms pulled so far. If None, return the running total
+                kept since track_regret() (O(1)); ValueError if regret is
+                not tracked
+        """
+        if history is None:
+            if self._regret_gaps is None:
+                raise ValueError("Regret is not tracked: call track_regret(environment) before pulling, "
+                                 "or pass the history of pulled arms")
+            return self.cumulative_regret
+        return float(np.sum(environment.gaps[np.asarray(history, dtype=int)]))
+    
+    def hyperparameters(self) -> Dict[str, Any]:
+        """
+        Constructor settings that define the algorithm (JSON-serialisable)
+        
+        Subclasses add their own. A checkpoint can only be restored into an
+        algorithm with the same hyperparameters.
+        """
+        params = {'class': type(self).__name__, 'n_arms': self.n_arms}
+        if self.estimator is not None:
+            params['estimator'] = self.estimator.hyperparameters()
+        return params
+    
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Learned state: arrays plus JSON-serialisable scalars
+        
+        Includes the random generator state, so a restored algorithm makes
+        exactly the decisions the original would have made.
+        """
+        state = {
+            'pulls': self.pulls,
+            'rewards': self.rewards,
+            'estimates': self.estimates,
+            'total_pulls': int(self.total_pulls),
+            'cumulative_regret': float(self.cumulative_regret),
+            'rng': self.rng.bit_generator.state
+        }
+        if self.estimator is not None:
+            for key, value in self.estimator.get_state().items():
+                state[f'estimator.{key}'] = value
+        return state
+    
+    def set_state(self, state: Dict[str, Any]):
+        """
+        Restore state from get_state()
+        
+        Arrays are adopted as given (not copied), so memory-mapped arrays
+        from a checkpoint are used in place.
+        """
+        self.pulls = state['pulls']
+        self.rewards = state['rewards']
+        self.estimates = state['estimates']
+        self.total_pulls = state['total_pulls']
+        self.cumulative_regret = state['cumulative_regret']
+        self.rng.bit_generator.state = state['rng']
+        if self.estimator is not None:
+            prefix = 'estimator.'
+            self.estimator.set_state({key[len(prefix):]: value for key, value in state.items()
+                                      if key.startswith(prefix)})
+            self.estimates = self.estimator.estimates
+        # Every arm may have changed; let subclasses rebuild derived state
+        self._after_bulk_update(np.arange(self.n_arms), self.pulls)
     
     def reset(self):
         """Reset algorithm state"""
         self.pulls = np.zeros(self.n_arms, dtype=int)
         self.rewards = np.zeros(self.n_arms)
-        self.estimates = np.zeros(self.n_arms) 
\ No newline at end of file
+        self.estimates = np.zeros(self.n_arms)
+        self.total_pulls = 0
+        self.cumulative_regret = 0.0
+        if self.estimator is not None:
+            self.estimator.reset(self.n_arms)
+            self.estimates = self.estimator.estimates
\ No newline at end of file
@@ -1,15 +1,24 @@
 import numpy as np
+from typing import Dict, Any
 from algorithms.base_algorithm import BaseMABAlgorithm
+from algorithms.arm_index import ArgmaxTree
 
 class EpsilonGreedy(BaseMABAlgorithm):
     """
     Epsilon-Greedy algorithm
     With probability epsilon: explore (random arm)
     With probability 1-epsilon: exploit (best estimated arm)
+    
+    With indexed=True the best estimated arm is tracked in a tournament tree,
+    making each decision O(log n_arms) instead of O(n_arms) for large arm sets.
     """
-    def __init__(self, n_arms: int, epsilon: float = 0.1, **kwargs):
+    def __init__(self, n_arms: int, epsilon: float = 0.1, indexed: bool = False, **kwargs):
         super().__init__(n_arms, **kwargs)
         self.epsilon = epsilon
+        self.indexed = indexed
+        if indexed and self.estimator is not None:
+            raise ValueError("Indexed selection requires sample-mean estimates (estimator=None)")
+        self._index = ArgmaxTree(self.estimates) if indexed else None
         
     def select_arm(self) -> int:
         """
@@ -24,7 +33,7 @@ class EpsilonGreedy(BaseMABAlgorithm):
         - If no arm pulled yet, select arm 0
         """
         # TODO: Implement epsilon greedy algorithm
-        # Hint: Use np.random.random() to generate random number between 0 and 1
+        # Hint: Use self.rng.random() to generate random number between 0 and 1
         # If random number < epsilon: explore (random arm)
         # Else: exploit (best estimated arm)
         # Check if no pulls yet and handle that case
@@ -33,8 +42,62 @@ class EpsilonGreedy(BaseMABAlgorithm):
         # pass
         
         # SOLUTION
-        if np.random.random() < self.epsilon:
-            return np.random.randint(0, self.n_arms)
-        if np.sum(self.pulls) == 0:
+        if self.rng.random() < self.epsilon:
+            return int(self.rng.integers(0, self.n_arms))
+        if self.total_pulls == 0:
             return 0
-        return np.argmax(self.estimates) 
\ No newline at end of file
+        if self._index is not None:
+            return self._index.argmax()
+        return np.argmax(self.estimates)
+    
+    def select_arms(self, n: int) -> np.ndarray:
+        """Vectorized epsilon-greedy decisions from the current state"""
+        explore = self.rng.random(n) < self.epsilon
+        random_arms = self.rng.integers(0, self.n_arms, size=n)
+        if self.total_pulls == 0:
+            greedy_arm = 0
+        elif self._index is not None:
+            greedy_arm = self._index.argmax()
+        else:
+            greedy_arm = np.argmax(self.estimates)
+        return np.where(explore, random_arms, greedy_arm)
+    
+    def update(self, arm: int, reward: float):
+        super().update(arm, reward)
+        if self._index is not None:
+            self._index.update(arm, self.estimates[arm])
+    
+    def _after_bulk_update(self, arms: np.ndarray, counts: np.ndarray):
+        if self._index is None:
+            return
+        # Replaying many leaf paths costs more than one vectorized rebuild
+        if len(arms) > self.n_arms // 16:
+            self._index = ArgmaxTree(self.estimates)
+        else:
+            for arm, estimate in zip(arms.tolist(), self.estimates[arms].tolist()):
+                self._index.update(arm, estimate)
+    
+    def hyperparameters(self) -> Dict[str, Any]:
+        return {**super().hyperparameters(), 'epsilon': self.epsilon, 'indexed': self.indexed}
+    
+    def reset(self):
+        super().reset()
+        if self.indexed:
+            self._index = ArgmaxTree(self.estimates)
+    
+    def select_arm_batch(self, agents: np.ndarray = None) -> np.ndarray:
+        """
+        Vectorized epsilon-greedy selection for many independent runs
+        
+        Args:
+            agents: Row indices of the runs to select for (all runs if None)
+            
+        Returns:
+            Array with the arm selected by each requested run
+        """
+        agents = self._batch_agents(agents)
+        explore = self.rng.random(len(agents)) < self.epsilon
+        random_arms = self.rng.integers(0, self.n_arms, size=len(agents))
+        # Runs without pulls have all-zero estimates, so argmax falls back to arm 0
+        greedy_arms = np.argmax(self.batch_estimates[agents], axis=1)
+        return np.where(explore, random_arms, greedy_arms)
@@ -0,0 +1,145 @@
+import numpy as np
+from typing import Dict, Any
+
+class SlidingWindowEstimator:
+    """
+    Reward estimates over the last `window` pulls (across all arms)
+    
+    The window is a ring buffer of (arm, reward) pairs with per-arm running
+    counts and sums: each update adds the new observation and evicts the
+    oldest one, so it costs O(1) whatever the window size. Running sums are
+    recomputed from the buffer once per pass over it to stop floating-point
+    drift from the repeated subtractions.
+    """
+    def __init__(self, window: int):
+        """
+        Args:
+            window: Number of most recent pulls the estimates are based on
+        """
+        if window < 1:
+            raise ValueError(f"window must be >= 1, got {window}")
+        self.window = window
+    
+    def reset(self, n_arms: int):
+        """Forget all observations"""
+        self.n_arms = n_arms
+        self.counts = np.zeros(n_arms, dtype=int)  # Pulls of each arm inside the window
+        self.sums = np.zeros(n_arms)  # Reward sums of each arm inside the window
+        self.estimates = np.zeros(n_arms)
+        self._arms = np.zeros(self.window, dtype=int)
+        self._rewards = np.zeros(self.window)
+        self._cursor = 0
+        self._size = 0
+    
+    def update(self, arm: int, reward: float):
+        """Add one observation, evicting the oldest once the window is full"""
+        cursor = self._cursor
+        if self._size == self.window:
+            old_arm = self._arms[cursor]
+            self.counts[old_arm] -= 1
+            self.sums[old_arm] -= self._rewards[cursor]
+            self.estimates[old_arm] = self.sums[old_arm] / self.counts[old_arm] if self.counts[old_arm] else 0.0
+        else:
+            self._size += 1
+        
+        self._arms[cursor] = arm
+        self._rewards[cursor] = reward
+        self.counts[arm] += 1
+        self.sums[arm] += reward
+        self.estimates[arm] = self.sums[arm] / self.counts[arm]
+        
+        self._cursor = cursor + 1
+        if self._cursor == self.window:
+            self._cursor = 0
+            self.sums[:] = np.bincount(self._arms, weights=self._rewards, minlength=self.n_arms)
+            self.estimates[:] = 0.0
+            np.divide(self.sums, self.counts, out=self.estimates, where=self.counts > 0)
+    
+    def hyperparameters(self) -> Dict[str, Any]:
+        return {'class': type(self).__name__, 'window': self.window}
+    
+    def get_state(self) -> Dict[str, Any]:
+        return {'counts': self.counts, 'sums': self.sums, 'estimates': self.estimates,
+                'arms': self._arms, 'rewards': self._rewards, 'cursor': self._cursor, 'size': self._size}
+    
+    def set_state(self, state: Dict[str, Any]):
+        self.n_arms = len(state['counts'])
+        self.counts, self.sums, self.estimates = state['counts'], state['sums'], state['estimates']
+        self._arms, self._rewards = state['arms'], state['rewards']
+        self._cursor, self._size = state['cursor'], state['size']
+    
+    def effective_pulls(self) -> np.ndarray:
+        """Pulls of each arm inside the window"""
+        return self.counts
+    
+    def effective_total(self) -> float:
+        """Number of observations inside the window"""
+        return self._size
+
+class DiscountedEstimator:
+    """
+    Exponentially discounted reward estimates
+    
+    An observation made k pulls ago has weight gamma**k. Decaying every arm
+    on every pull would be O(n_arms), so weights are kept relative to a global
+    scale instead: the newest observation is stored with weight scale, scale
+    grows by 1 / gamma per pull, and the true discounted count of an arm is
+    its stored count divided by scale. Estimates are ratios of stored sums and
+    counts, so only the pulled arm's estimate changes, and stored values are
+    renormalised before scale can overflow.
+    """
+    # Renormalise stored weights once scale exceeds this
+    MAX_SCALE = 1e100
+    
+    def __init__(self, gamma: float):
+        """
+        Args:
+            gamma: Discount factor per pull, in (0, 1]
+        """
+        if not 0 < gamma <= 1:
+            raise ValueError(f"gamma must be in (0, 1], got {gamma}")
+        self.gamma = gamma
+    
+    def reset(self, n_arms: int):
+        """Forget all observations"""
+        self.n_arms = n_arms
+        self.counts = np.zeros(n_arms)  # Discounted counts, times scale
+        self.sums = np.zeros(n_arms)  # Discounted reward sums, times scale
+        self.estimates = np.zeros(n_arms)
+        self.scale = 1.0
+        self._total = 0.0
+    
+    def update(self, arm: int, reward: float):
+        """Add one observation, implicitly decaying all earlier ones by gamma"""
+        if self._total > 0:
+            self.scale /= self.gamma
+            if self.scale > self.MAX_SCALE:
+                self.counts /= self.scale
+                self.sums /= self.scale
+                self._total /= self.scale
+                self.scale = 1.0
+        
+        self.counts[arm] += self.scale
+        self.sums[arm] += self.scale * reward
+        self._total += self.scale
+        self.estimates[arm] = self.sums[arm] / self.counts[arm]
+    
+    def hyperparameters(self) -> Dict[str, Any]:
+        return {'class': type(self).__name__, 'gamma': self.gamma}
+    
+    def get_state(self) -> Dict[str, Any]:
+        return {'counts': self.counts, 'sums': self.sums, 'estimates': self.estimates,
+                'scale': self.scale, 'total': self._total}
+    
+    def set_state(self, state: Dict[str, Any]):
+        self.n_arms = len(state['counts'])
+        self.counts, self.sums, self.estimates = state['counts'], state['sums'], state['estimates']
+        self.scale, self._total = state['scale'], state['total']
+    
+    def effective_pulls(self) -> np.ndarray:
+        """Discounted pull count of each arm (O(n_arms), computed on demand)"""
+        return self.counts / self.scale
+    
+    def effective_total(self) -> float:
+        """Discounted number of pulls"""
+        return self._total / self.scale
@@ -19,3 +19,21 @@ class ExploitationOnly(BaseMABAlgorithm):
         Note: If no arm has been pulled yet, select arm 0
         """
         pass
+    
+    def select_arms(self, n: int) -> np.ndarray:
+        """Greedy decisions from the current state (all the same arm)"""
+        return np.full(n, np.argmax(self.estimates))
+    
+    def select_arm_batch(self, agents: np.ndarray = None) -> np.ndarray:
+        """
+        Vectorized greedy selection for many independent runs
+        
+        Args:
+            agents: Row indices of the runs to select for (all runs if None)
+            
+        Returns:
+            Array with the arm selected by each requested run
+        """
+        agents = self._batch_agents(agents)
+        # Runs without pulls have all-zero estimates, so argmax falls back to arm 0
+        return np.argmax(self.batch_estimates[agents], axis=1)
@@ -18,11 +18,28 @@ class ExplorationOnly(BaseMABAlgorithm):
         Strategy: Pure exploration - randomly select any arm with equal probability
         """
         # TODO: Implement exploration only algorithm
-        # Hint: Use np.random.randint() to randomly select an arm
+        # Hint: Use self.rng.integers() to randomly select an arm
         # Return: randomly selected arm index between 0 and self.n_arms-1
         
         # YOUR CODE HERE
         pass
         
         # SOLUTION (commented out for students):
-        # return np.random.randint(0, self.n_arms) 
\ No newline at end of file
+        # return int(self.rng.integers(0, self.n_arms)) 
+    
+    def select_arms(self, n: int) -> np.ndarray:
+        """Vectorized uniform random decisions"""
+        return self.rng.integers(0, self.n_arms, size=n)
+    
+    def select_arm_batch(self, agents: np.ndarray = None) -> np.ndarray:
+        """
+        Vectorized uniform random selection for many independent runs
+        
+        Args:
+            agents: Row indices of the runs to select for (all runs if None)
+            
+        Returns:
+            Array with the arm selected by each requested run
+        """
+        agents = self._batch_agents(agents)
+        return self.rng.integers(0, self.n_arms, size=len(agents))
@@ -0,0 +1,185 @@
+import numpy as np
+from typing import Dict, Any
+from algorithms.base_algorithm import BaseMABAlgorithm
+
+class LinUCB(BaseMABAlgorithm):
+    """
+    LinUCB contextual bandit (Li et al., 2010)
+    
+    Models the expected reward of arm a in context x as x @ theta_a and pulls
+    the arm maximising x @ theta_a + alpha * sqrt(x @ A_a^-1 @ x), where
+    A_a = ridge * I + sum of x x^T over a's pulls and theta_a = A_a^-1 b_a.
+    
+    Only the inverses A_a^-1 are stored. A pull changes A_a by the rank-1
+    term x x^T, so the inverse is updated in O(d^2) with the Sherman-Morrison
+    formula instead of an O(d^3) solve. All arms (and all requests of a
+    select_arms call) are scored at once with batched products against the
+    (n_arms, d, d) stack of inverses.
+    
+    With shared=True all arms share one theta and one A (arms differ only
+    through their feature vectors).
+    """
+    def __init__(self, n_arms: int, n_features: int, alpha: float = 1.0, shared: bool = False,
+                 ridge: float = 1.0, **kwargs):
+        """
+        Args:
+            n_arms: Number of arms
+            n_features: Dimension d of the feature vectors
+            alpha: Width of the confidence bonus
+            shared: One parameter vector for all arms instead of one per arm
+            ridge: Ridge regularisation (A starts as ridge * I)
+        """
+        super().__init__(n_arms, **kwargs)
+        self.n_features = n_features
+        self.alpha = alpha
+        self.shared = shared
+        self.ridge = ridge
+        self._reset_model()
+    
+    def _reset_model(self):
+        n_models = 1 if self.shared else self.n_arms
+        self.A_inv = np.tile(np.eye(self.n_features) / self.ridge, (n_models, 1, 1))
+        self.b = np.zeros((n_models, self.n_features))
+        self.theta = np.zeros((n_models, self.n_features))
+    
+    def _check_contexts(self, contexts: np.ndarray) -> np.ndarray:
+        if contexts is None:
+            raise ValueError("LinUCB needs a context; pass the environment's observe() output")
+        contexts = np.asarray(contexts, dtype=float)
+        if contexts.shape[-1] != self.n_features:
+            raise ValueError(f"Contexts must have {self.n_features} features, got {contexts.shape[-1]}")
+        # A single feature vector is used for every arm
+        if contexts.ndim == 1:
+            contexts = np.broadcast_to(contexts, (self.n_arms, self.n_features))
+        return contexts
+    
+    def scores(self, contexts: np.ndarray) -> np.ndarray:
+        """
+        Upper confidence bounds of every arm
+        
+        Args:
+            contexts: Shape (n_arms, d) or (n, n_arms, d); a single (d,)
+                vector is used for every arm
+        
+        Returns:
+            Scores of shape (n_arms,) or (n, n_arms)
+        """
+        contexts = self._check_contexts(contexts)
+        # A^-1 is symmetric, so x^T A^-1 is computed as a row-vector product
+        if self.shared:
+            means = contexts @ self.theta[0]
+            A_inv_x = contexts @ self.A_inv[0]
+        else:
+            means = np.einsum('...kd,kd->...k', contexts, self.theta)
+            if contexts.ndim == 2:
+                A_inv_x = (contexts[:, None, :] @ self.A_inv)[:, 0, :]
+            else:
+                # (n, K, d) -> (K, n, d): one (n x d) @ (d x d) product per arm
+                A_inv_x = np.swapaxes(np.swapaxes(contexts, 0, 1) @ self.A_inv, 0, 1)
+        variances = np.einsum('...kd,...kd->...k', A_inv_x, contexts)
+        return means + self.alpha * np.sqrt(np.maximum(variances, 0.0))
+    
+    def select_arm(self, contexts: np.ndarray = None) -> int:
+        """
+        Select the arm with the highest upper confidence bound
+        
+        Args:
+            contexts: Feature vectors of this round, shape (n_arms, d)
+        
+        Returns:
+            Index of the arm to pull
+        """
+        return int(np.argmax(self.scores(contexts)))
+    
+    def select_arms(self, n: int, contexts: np.ndarray = None) -> np.ndarray:
+        """
+        Decisions for n concurrent requests from the current state
+        
+        Args:
+            n: Number of decisions
+            contexts: Contexts of the requests, shape (n, n_arms, d)
+        
+        Returns:
+            Array of n selected arms
+        """
+        contexts = self._check_contexts(contexts)
+        if contexts.ndim != 3 or len(contexts) != n:
+            raise ValueError(f"Expected contexts for {n} requests, got shape {contexts.shape}")
+        return np.argmax(self.scores(contexts), axis=1)
+    
+    def update(self, arm: int, reward: float, contexts: np.ndarray = None):
+        """
+        Update with the reward observed for arm in the given round
+        
+        Args:
+            arm: Arm that was pulled
+            reward: Observed reward
+            contexts: Feature vectors of the round, shape (n_arms, d), or the
+                pulled arm's (d,) vector
+        """
+        if contexts is None:
+            raise ValueError("LinUCB needs the round's context to update")
+        super().update(arm, reward)
+        contexts = np.asarray(contexts, dtype=float)
+        self._update_model(arm, reward, contexts[arm] if contexts.ndim == 2 else contexts)
+    
+    def ingest(self, arms: np.ndarray, rewards: np.ndarray, contexts: np.ndarray = None):
+        """
+        Apply many delayed observations at once
+        
+        Counters are updated in bulk as in BaseMABAlgorithm.ingest; the model
+        gets one Sherman-Morrison update per observation, in order.
+        
+        Args:
+            arms: Array of pulled arms
+            rewards: Array with the reward observed for each entry of arms
+            contexts: Feature vectors of each observation's round, shape
+                (n, n_arms, d), or the pulled arms' vectors, shape (n, d)
+        """
+        if contexts is None:
+            raise ValueError("LinUCB needs the rounds' contexts to ingest observations")
+        arms = np.asarray(arms, dtype=int).ravel()
+        rewards = np.asarray(rewards, dtype=float).ravel()
+        contexts = np.asarray(contexts, dtype=float)
+        if contexts.ndim not in (2, 3) or len(contexts) != len(arms) or contexts.shape[-1] != self.n_features:
+            raise ValueError(f"Expected contexts of shape ({len(arms)}, [n_arms,] {self.n_features}), "
+                             f"got {contexts.shape}")
+        super().ingest(arms, rewards)
+        if contexts.ndim == 3:
+            contexts = contexts[np.arange(len(arms)), arms]
+        for arm, reward, x in zip(arms.tolist(), rewards.tolist(), contexts):
+            self._update_model(arm, reward, x)
+    
+    def _update_model(self, arm: int, reward: float, x: np.ndarray):
+        model = 0 if self.shared else arm
+        
+        # Sherman-Morrison: (A + x x^T)^-1 = A^-1 - (A^-1 x)(A^-1 x)^T / (1 + x^T A^-1 x)
+        A_inv = self.A_inv[model]
+        A_inv_x = A_inv @ x
+        A_inv -= np.outer(A_inv_x, A_inv_x) / (1.0 + x @ A_inv_x)
+        self.b[model] += reward * x
+        self.theta[model] = A_inv @ self.b[model]
+    
+    def reset_batch(self, n_runs: int):
+        raise ValueError("LinUCB does not support batched runs; its model needs each round's context")
+    
+    def select_arm_batch(self, agents: np.ndarray = None) -> np.ndarray:
+        raise ValueError("LinUCB does not support batched runs; its model needs each round's context")
+    
+    def update_batch(self, arms: np.ndarray, rewards: np.ndarray, agents: np.ndarray = None):
+        raise ValueError("LinUCB does not support batched runs; its model needs each round's context")
+    
+    def hyperparameters(self) -> Dict[str, Any]:
+        return {**super().hyperparameters(), 'n_features': self.n_features, 'alpha': self.alpha,
+                'shared': self.shared, 'ridge': self.ridge}
+    
+    def get_state(self) -> Dict[str, Any]:
+        return {**super().get_state(), 'A_inv': self.A_inv, 'b': self.b, 'theta': self.theta}
+    
+    def set_state(self, state: Dict[str, Any]):
+        super().set_state(state)
+        self.A_inv, self.b, self.theta = state['A_inv'], state['b'], state['theta']
+    
+    def reset(self):
+        super().reset()
+        self._reset_model()
@@ -0,0 +1,102 @@
+import numpy as np
+from typing import Tuple, Dict, Any
+from algorithms.base_algorithm import BaseMABAlgorithm
+
+class ThompsonSampling(BaseMABAlgorithm):
+    """
+    Thompson Sampling with conjugate priors
+    
+    Sample a mean for every arm from its posterior and pull the arm with the
+    highest sample. Posteriors are computed from the base-class pulls and
+    rewards arrays, which are exactly the conjugate sufficient statistics:
+    
+    - 'bernoulli': Beta(prior_alpha + rewards, prior_beta + pulls - rewards)
+    - 'normal': Normal prior N(prior_mean, prior_std**2) with known reward
+      noise noise_std
+    
+    All arms (and, in select_arms/select_arm_batch, all decisions) are
+    sampled in one vectorized generator call.
+    """
+    def __init__(self, n_arms: int, family: str = 'bernoulli', prior_alpha: float = 1.0,
+                 prior_beta: float = 1.0, prior_mean: float = 0.0, prior_std: float = 1.0,
+                 noise_std: float = 1.0, **kwargs):
+        """
+        Args:
+            n_arms: Number of arms
+            family: Reward family, 'bernoulli' or 'normal'
+            prior_alpha, prior_beta: Beta prior of Bernoulli arms
+            prior_mean, prior_std: Normal prior of Normal arm means
+            noise_std: Known standard deviation of Normal rewards
+        """
+        super().__init__(n_arms, **kwargs)
+        if family not in ('bernoulli', 'normal'):
+            raise ValueError(f"Unknown reward family: {family}")
+        self.family = family
+        self.prior_alpha = prior_alpha
+        self.prior_beta = prior_beta
+        self.prior_mean = prior_mean
+        self.prior_std = prior_std
+        self.noise_std = noise_std
+    
+    def hyperparameters(self) -> Dict[str, Any]:
+        return {**super().hyperparameters(), 'family': self.family,
+                'prior_alpha': self.prior_alpha, 'prior_beta': self.prior_beta,
+                'prior_mean': self.prior_mean, 'prior_std': self.prior_std, 'noise_std': self.noise_std}
+    
+    def _sufficient_statistics(self, pulls: np.ndarray = None, rewards: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pull counts and reward sums the posterior is based on
+        
+        Uses the given batch rows, else the algorithm's own arrays (windowed
+        or discounted when an estimator is set).
+        """
+        if pulls is not None:
+            return pulls, rewards
+        if self.estimator is not None:
+            pulls = self.estimator.effective_pulls()
+            return pulls, self.estimates * pulls
+        return self.pulls, self.rewards
+    
+    def sample_means(self, n: int = None, pulls: np.ndarray = None, rewards: np.ndarray = None) -> np.ndarray:
+        """
+        Draw arm means from the posterior
+        
+        Args:
+            n: Number of independent draws (None for a single draw)
+            pulls, rewards: Sufficient statistics to use instead of the
+                algorithm's own, shape (..., n_arms)
+        
+        Returns:
+            Array of shape (n_arms,), (n, n_arms), or that of pulls
+        """
+        pulls, rewards = self._sufficient_statistics(pulls, rewards)
+        shape = pulls.shape if n is None else (n,) + pulls.shape
+        
+        if self.family == 'bernoulli':
+            return self.rng.beta(self.prior_alpha + rewards, self.prior_beta + pulls - rewards, size=shape)
+        
+        precision = 1 / self.prior_std ** 2 + pulls / self.noise_std ** 2
+        mean = (self.prior_mean / self.prior_std ** 2 + rewards / self.noise_std ** 2) / precision
+        return self.rng.normal(mean, 1 / np.sqrt(precision), size=shape)
+    
+    def select_arm(self) -> int:
+        """Pull the arm with the highest posterior sample"""
+        return int(np.argmax(self.sample_means()))
+    
+    def select_arms(self, n: int) -> np.ndarray:
+        """n independent Thompson decisions from one (n, n_arms) posterior draw"""
+        return np.argmax(self.sample_means(n), axis=1)
+    
+    def select_arm_batch(self, agents: np.ndarray = None) -> np.ndarray:
+        """
+        Vectorized Thompson sampling for many independent runs
+        
+        Args:
+            agents: Row indices of the runs to select for (all runs if None)
+        
+        Returns:
+            Array with the arm selected by each requested run
+        """
+        agents = self._batch_agents(agents)
+        samples = self.sample_means(pulls=self.batch_pulls[agents], rewards=self.batch_rewards[agents])
+        return np.argmax(samples, axis=1)
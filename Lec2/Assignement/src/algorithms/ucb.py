@@ -1,14 +1,23 @@
 import numpy as np
+from typing import Dict, Any
 from algorithms.base_algorithm import BaseMABAlgorithm
+from algorithms.arm_index import UCBIndex
 
 class UCB(BaseMABAlgorithm):
     """
     Upper Confidence Bound (UCB) algorithm
     Balances exploration and exploitation using confidence bounds
+    
+    With indexed=True scores are kept in a lazily-invalidated heap, making
+    each decision roughly O(log n_arms) instead of O(n_arms) for large arm sets.
     """
-    def __init__(self, n_arms: int, c: float = 2.0, **kwargs):
+    def __init__(self, n_arms: int, c: float = 2.0, indexed: bool = False, **kwargs):
         super().__init__(n_arms, **kwargs)
         self.c = c  # Exploration parameter
+        self.indexed = indexed
+        if indexed and self.estimator is not None:
+            raise ValueError("Indexed selection requires sample-mean estimates (estimator=None)")
+        self._index = UCBIndex(self.estimates, self.pulls, c) if indexed else None
         
     def select_arm(self) -> int:
         """
@@ -22,13 +31,50 @@ class UCB(BaseMABAlgorithm):
         - Otherwise: select arm with highest UCB value
         - UCB formula: estimate + c * sqrt(log(total_pulls) / arm_pulls)
         """
+        # Large-arm fast path (see algorithms/arm_index.py)
+        if self._index is not None:
+            return self._index.select(self.total_pulls)
+        
         # TODO: Implement UCB algorithm
         # Hint: 
         # 1. Check for unpulled arms using np.where(self.pulls == 0)[0]
         # 2. If unpulled arms exist, return the first one
-        # 3. Calculate total_pulls = np.sum(self.pulls)
+        # 3. Use total_pulls = self.total_pulls
         # 4. Calculate UCB values: estimate + c * sqrt(log(total_pulls) / arm_pulls)
         # 5. Return arm with highest UCB value
+        # (With a non-stationary estimator, use self.effective_pulls() and
+        #  self.effective_total() in place of self.pulls and total_pulls)
         
         # YOUR CODE HERE
         pass
+    
+    def select_arms(self, n: int) -> np.ndarray:
+        """UCB decisions from the current state (deterministic, so all the same arm)"""
+        return np.full(n, self.select_arm())
+    
+    def update(self, arm: int, reward: float):
+        super().update(arm, reward)
+        if self._index is not None:
+            self._index.update(arm)
+    
+    def _after_bulk_update(self, arms: np.ndarray, counts: np.ndarray):
+        if self._index is None:
+            return
+        if len(arms) > self.n_arms // 16:
+            self._index = UCBIndex(self.estimates, self.pulls, self.c)
+        else:
+            for arm, n_added in zip(arms.tolist(), counts.tolist()):
+                self._index.update(arm, n_added)
+    
+    def hyperparameters(self) -> Dict[str, Any]:
+        return {**super().hyperparameters(), 'c': self.c, 'indexed': self.indexed}
+    
+    def reset(self):
+        super().reset()
+        if self.indexed:
+            self._index = UCBIndex(self.estimates, self.pulls, self.c)
+    
+    def reset_batch(self, n_runs: int):
+        if self.indexed:
+            raise ValueError("Indexed selection tracks a single run; use indexed=False for batched runs")
+        super().reset_batch(n_runs)
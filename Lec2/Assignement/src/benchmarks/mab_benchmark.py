@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmarks for the MAB framework
+
+Measures, for every algorithm class and arm count:
+  - environment pulls/second (MABEnvironment.pull)
+  - updates/second (BaseMABAlgorithm.update)
+  - selections/second (select_arm, if implemented)
+  - run_experiment steps/second and peak traced memory for each horizon
+  - UCB(indexed=True) selections/second against the dense UCB rule, and
+    the fraction of decisions on which the two agree
+  - LinUCB selections/updates per second (disjoint and shared parameters)
+    and batched select_arms decisions per second, for each feature dimension
+
+Results are written as JSON and can be compared against a stored baseline:
+
+    python -m benchmarks.mab_benchmark --output bench.json
+    python -m benchmarks.mab_benchmark --baseline bench.json --threshold 0.1
+
+The process exits with status 1 if any metric regressed by more than the
+threshold.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict, Any, List
+
+import numpy as np
+
+from utils.config import MABConfig
+from environment.mab_environment import MABEnvironment
+from environment.contextual_environment import ContextualMABEnvironment
+from experiments.experiment_runner import MABExperimentRunner
+from algorithms.exploration_only import ExplorationOnly
+from algorithms.exploitation_only import ExploitationOnly
+from algorithms.epsilon_greedy import EpsilonGreedy
+from algorithms.ucb import UCB
+from algorithms.thompson_sampling import ThompsonSampling
+from algorithms.lin_ucb import LinUCB
+
+ALGORITHMS = {
+    'ExplorationOnly': ExplorationOnly,
+    'ExploitationOnly': ExploitationOnly,
+    'EpsilonGreedy': EpsilonGreedy,
+    'UCB': UCB,
+    'ThompsonSampling': ThompsonSampling
+}
+
+DEFAULT_ARM_COUNTS = [5, 100, 10_000]
+DEFAULT_HORIZONS = [MABConfig().n_trials]
+DEFAULT_FEATURE_DIMS = [8, 64, 256]
+LINUCB_ARMS = 10
+LINUCB_BATCH = 256
+
+# Metrics where a larger value is worse; all others are throughputs
+LOWER_IS_BETTER = ('peak_memory_bytes',)
+
+class ReferenceUCB(UCB):
+    """UCB with the dense rule filled in, as the baseline for indexed=True"""
+    def select_arm(self) -> int:
+        unpulled = np.flatnonzero(self.pulls == 0)
+        if len(unpulled):
+            return int(unpulled[0])
+        return int(np.argmax(self.estimates + self.c * np.sqrt(np.log(self.total_pulls) / self.pulls)))
+
+def _best_rate(func, n_ops: int, repeat: int) -> float:
+    """Best operations/second of func() (which performs n_ops operations) over repeat runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return n_ops / best
+
+def _is_implemented(algorithm) -> bool:
+    """Whether select_arm returns an arm (the student stubs return None)"""
+    try:
+        return algorithm.select_arm() is not None
+    except Exception:
+        return False
+
+def bench_environment(n_arms: int, n_ops: int, repeat: int, seed: int) -> Dict[str, float]:
+    """Pulls/second of MABEnvironment.pull on uniformly random arms"""
+    environment = MABEnvironment(n_arms, seed=seed)
+    arms = np.random.default_rng(seed).integers(0, n_arms, size=n_ops).tolist()
+    
+    def run():
+        for arm in arms:
+            environment.pull(arm)
+    
+    return {'pulls_per_sec': _best_rate(run, n_ops, repeat)}
+
+def bench_algorithm(algorithm_class, n_arms: int, horizons: List[int], n_ops: int, repeat: int,
+                    seed: int) -> Dict[str, Any]:
+    """Update/select throughput and run_experiment cost of one algorithm class"""
+    rng = np.random.default_rng(seed)
+    arms = rng.integers(0, n_arms, size=n_ops).tolist()
+    rewards = rng.random(n_ops).tolist()
+    algorithm = algorithm_class(n_arms, seed=seed)
+    
+    def run_updates():
+        algorithm.reset()
+        for arm, reward in zip(arms, rewards):
+            algorithm.update(arm, reward)
+    
+    results = {'updates_per_sec': _best_rate(run_updates, n_ops, repeat)}
+    
+    if not _is_implemented(algorithm):
+        results['skipped'] = 'select_arm not implemented'
+        return results
+    
+    def run_selects():
+        for _ in range(n_ops):
+            algorithm.select_arm()
+    
+    results['selects_per_sec'] = _best_rate(run_selects, n_ops, repeat)
+    
+    config = MABConfig()
+    config.n_arms = n_arms
+    config.seed = seed
+    for horizon in horizons:
+        runner = MABExperimentRunner(config)
+        results[f'horizon={horizon}'] = {
+            'steps_per_sec': _best_rate(lambda: runner.run_experiment(algorithm, horizon), horizon, repeat)
+        }
+        tracemalloc.start()
+        runner.run_experiment(algorithm, horizon)
+        results[f'horizon={horizon}']['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return results
+
+def bench_indexed_ucb(n_arms: int, n_ops: int, repeat: int, seed: int) -> Dict[str, float]:
+    """Select throughput of UCB(indexed=True) and the dense rule after n_ops shared steps"""
+    environment = MABEnvironment(n_arms, seed=seed)
+    dense = ReferenceUCB(n_arms, seed=seed)
+    indexed = UCB(n_arms, indexed=True, seed=seed)
+    
+    # Drive both with the dense rule's choices so their states stay identical
+    agreed = 0
+    for _ in range(n_ops):
+        arm = dense.select_arm()
+        agreed += indexed.select_arm() == arm
+        reward = environment.pull(arm)
+        dense.update(arm, reward)
+        indexed.update(arm, reward)
+    
+    def run_selects(algorithm):
+        for _ in range(n_ops):
+            algorithm.select_arm()
+    
+    return {
+        'dense_selects_per_sec': _best_rate(lambda: run_selects(dense), n_ops, repeat),
+        'indexed_selects_per_sec': _best_rate(lambda: run_selects(indexed), n_ops, repeat),
+        'agreement': agreed / n_ops
+    }
+
+def bench_linucb(n_features: int, shared: bool, n_ops: int, repeat: int, seed: int) -> Dict[str, float]:
+    """Select/update throughput of LinUCB with n_features-dimensional contexts"""
+    environment = ContextualMABEnvironment(LINUCB_ARMS, n_features, shared=shared, seed=seed)
+    contexts = environment.observe_batch(n_ops)
+    rng = np.random.default_rng(seed)
+    arms = rng.integers(0, LINUCB_ARMS, size=n_ops).tolist()
+    rewards = rng.random(n_ops).tolist()
+    algorithm = LinUCB(LINUCB_ARMS, n_features, shared=shared, seed=seed)
+    
+    def run_updates():
+        algorithm.reset()
+        for context, arm, reward in zip(contexts, arms, rewards):
+            algorithm.update(arm, reward, context)
+    
+    def run_selects():
+        for context in contexts:
+            algorithm.select_arm(context)
+    
+    def run_batched_selects():
+        for start in range(0, n_ops, LINUCB_BATCH):
+            batch = contexts[start:start + LINUCB_BATCH]
+            algorithm.select_arms(len(batch), batch)
+    
+    return {
+        'updates_per_sec': _best_rate(run_updates, n_ops, repeat),
+        'selects_per_sec': _best_rate(run_selects, n_ops, repeat),
+        'batched_selects_per_sec': _best_rate(run_batched_selects, n_ops, repeat)
+    }
+
+def run_benchmarks(arm_counts: List[int] = None, horizons: List[int] = None, n_ops: int = 20_000,
+                   repeat: int = 3, seed: int = 0, feature_dims: List[int] = None) -> Dict[str, Any]:
+    """
+    Run the full benchmark suite
+    
+    Args:
+        arm_counts: Numbers of arms to benchmark
+        horizons: run_experiment horizons to benchmark
+        n_ops: Number of pulls/updates/selections per throughput measurement
+        repeat: Repetitions per measurement (the best one is kept)
+        seed: Seed for all environments, algorithms and inputs
+        feature_dims: LinUCB context dimensions to benchmark
+    
+    Returns:
+        Dictionary with run metadata under 'meta' and measurements under 'results'
+    """
+    arm_counts = arm_counts or DEFAULT_ARM_COUNTS
+    horizons = horizons or DEFAULT_HORIZONS
+    feature_dims = feature_dims or DEFAULT_FEATURE_DIMS
+    
+    results = {}
+    for n_arms in arm_counts:
+        print(f"Benchmarking n_arms={n_arms}...")
+        results[f'MABEnvironment/arms={n_arms}'] = bench_environment(n_arms, n_ops, repeat, seed)
+        for name, algorithm_class in ALGORITHMS.items():
+            results[f'{name}/arms={n_arms}'] = bench_algorithm(algorithm_class, n_arms, horizons,
+                                                               n_ops, repeat, seed)
+        results[f'UCB/indexed/arms={n_arms}'] = bench_indexed_ucb(n_arms, n_ops, repeat, seed)
+    
+    # The O(d^2) LinUCB steps are far slower than the scalar algorithms
+    linucb_ops = max(1, n_ops // 10)
+    for n_features in feature_dims:
+        print(f"Benchmarking LinUCB d={n_features}...")
+        for mode in ('disjoint', 'shared'):
+            results[f'LinUCB/d={n_features}/{mode}'] = bench_linucb(n_features, mode == 'shared',
+                                                                   linucb_ops, repeat, seed)
+    
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'arm_counts': arm_counts,
+            'horizons': horizons,
+            'feature_dims': feature_dims,
+            'n_ops': n_ops,
+            'repeat': repeat
+        },
+        'results': results
+    }
+
+def _flatten(results: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    """Flatten nested results into {'a/b/metric': value} for numeric values"""
+    flat = {}
+    for key, value in results.items():
+        path = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path + '/'))
+        elif isinstance(value, (int, float)):
+            flat[path] = value
+    return flat
+
+def compare_to_baseline(current: Dict[str, Any], baseline: Dict[str, Any],
+                        threshold: float = 0.1) -> List[str]:
+    """
+    Find metrics that regressed against a baseline
+    
+    Args:
+        current: Output of run_benchmarks
+        baseline: Previously stored output of run_benchmarks
+        threshold: Allowed relative slowdown (or memory growth), e.g. 0.1 = 10%
+    
+    Returns:
+        List of human-readable regression descriptions (empty if none)
+    """
+    current_flat = _flatten(current['results'])
+    baseline_flat = _flatten(baseline['results'])
+    
+    regressions = []
+    for metric, old in baseline_flat.items():
+        if metric not in current_flat or old == 0:
+            continue
+        new = current_flat[metric]
+        change = (new - old) / old
+        if metric.endswith(LOWER_IS_BETTER):
+            regressed = change > threshold
+        else:
+            regressed = change < -threshold
+        if regressed:
+            regressions.append(f"{metric}: {old:.4g} -> {new:.4g} ({change:+.1%})")
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the MAB framework")
+    parser.add_argument('--arms', type=int, nargs='+', default=DEFAULT_ARM_COUNTS,
+                        help="Numbers of arms to benchmark")
+    parser.add_argument('--horizons', type=int, nargs='+', default=DEFAULT_HORIZONS,
+                        help="run_experiment horizons to benchmark")
+    parser.add_argument('--features', type=int, nargs='+', default=DEFAULT_FEATURE_DIMS,
+                        help="LinUCB context dimensions to benchmark")
+    parser.add_argument('--n-ops', type=int, default=20_000,
+                        help="Operations per throughput measurement")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetitions per measurement")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write results JSON to this path")
+    parser.add_argument('--baseline', help="Baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Allowed relative regression before failing (default 0.1)")
+    args = parser.parse_args(argv)
+    
+    report = run_benchmarks(args.arms, args.horizons, args.n_ops, args.repeat, args.seed, args.features)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import numpy as np
+
+class ContextualMABEnvironment:
+    """
+    Contextual bandit environment with linear expected rewards
+    
+    Every round starts with observe(), which draws a feature vector for each
+    arm (rows of an (n_arms, n_features) context, unit norm). Pulling arm a
+    then pays contexts[a] @ theta_a + noise, where theta_a is arm a's own
+    parameter vector, or a single vector common to all arms with
+    shared=True.
+    """
+    def __init__(self, n_arms: int, n_features: int, shared: bool = False, noise_std: float = 0.1,
+                 theta: np.ndarray = None, seed: int = None, rng: np.random.Generator = None):
+        """
+        Initialize contextual environment
+        
+        Args:
+            n_arms: Number of arms/actions
+            n_features: Dimension d of the feature vectors
+            shared: One parameter vector for all arms instead of one per arm
+            noise_std: Standard deviation of the Gaussian reward noise
+            theta: Parameters, shape (d,) if shared else (n_arms, d); drawn
+                at random (unit norm) if None
+            seed: Random seed for reproducibility (ignored if rng is given)
+            rng: Random generator owned by this environment
+        """
+        self.n_arms = n_arms
+        self.n_features = n_features
+        self.shared = shared
+        self.noise_std = noise_std
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        
+        shape = (n_features,) if shared else (n_arms, n_features)
+        if theta is None:
+            theta = self.rng.standard_normal(shape)
+            theta /= np.linalg.norm(theta, axis=-1, keepdims=True)
+        self.theta = np.asarray(theta, dtype=float)
+        if self.theta.shape != shape:
+            raise ValueError(f"theta must have shape {shape}, got {self.theta.shape}")
+        
+        self.contexts = None
+        self.expected_rewards = None
+    
+    def _draw_contexts(self, size: tuple) -> np.ndarray:
+        """Unit-norm feature vectors of the given leading shape"""
+        contexts = self.rng.standard_normal(size + (self.n_features,))
+        contexts /= np.linalg.norm(contexts, axis=-1, keepdims=True)
+        return contexts
+    
+    def _expected(self, contexts: np.ndarray) -> np.ndarray:
+        """Expected reward of every arm for contexts of shape (..., n_arms, d)"""
+        if self.shared:
+            return contexts @ self.theta
+        return np.einsum('...kd,kd->...k', contexts, self.theta)
+    
+    def observe(self) -> np.ndarray:
+        """
+        Start a new round
+        
+        Returns:
+            Context of shape (n_arms, n_features), one feature vector per arm
+        """
+        self.contexts = self._draw_contexts((self.n_arms,))
+        self.expected_rewards = self._expected(self.contexts)
+        self.optimal_arm = int(np.argmax(self.expected_rewards))
+        return self.contexts
+    
+    def observe_batch(self, n: int) -> np.ndarray:
+        """
+        Draw contexts for n concurrent requests (does not start a round)
+        
+        Returns:
+            Contexts of shape (n, n_arms, n_features)
+        """
+        return self._draw_contexts((n, self.n_arms))
+    
+    def pull(self, arm: int) -> float:
+        """
+        Pull an arm in the current round
+        
+        Args:
+            arm: Arm index to pull
+        
+        Returns:
+            Reward from the arm
+        """
+        if self.contexts is None:
+            raise ValueError("No context observed; call observe() first")
+        if arm < 0 or arm >= self.n_arms:
+            raise ValueError(f"Invalid arm {arm}. Must be 0 <= arm < {self.n_arms}")
+        return self.expected_rewards[arm] + self.noise_std * self.rng.standard_normal()
+    
+    def pull_batch(self, arms: np.ndarray, contexts: np.ndarray) -> np.ndarray:
+        """
+        Rewards for n concurrent requests
+        
+        Args:
+            arms: Array of n arm indices
+            contexts: Contexts of the requests, shape (n, n_arms, n_features)
+        
+        Returns:
+            Array of n rewards
+        """
+        arms = np.asarray(arms)
+        expected = self._expected(contexts)[np.arange(len(arms)), arms]
+        return expected + self.noise_std * self.rng.standard_normal(len(arms))
+    
+    def get_optimal_arm(self) -> int:
+        """Get the arm with highest expected reward in the current round"""
+        return self.optimal_arm
+    
+    def get_regret(self, arm: int) -> float:
+        """Get regret for pulling a specific arm in the current round"""
+        return self.expected_rewards[self.optimal_arm] - self.expected_rewards[arm]
+    
+    def reset(self):
+        """Forget the current round"""
+        self.contexts = None
+        self.expected_rewards = None
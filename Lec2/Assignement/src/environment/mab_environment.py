@@ -1,54 +1,117 @@
 import numpy as np
-from typing import List, Dict, Any
-import random
+from typing import List, Dict, Any, Union
+from environment.reward_spec import RewardSpec
 
 class MABEnvironment:
     """
     Multi-Armed Bandit Environment
     """
-    def __init__(self, n_arms: int, reward_distributions: List[Dict] = None, seed: int = None):
+    # Arm parameters never change (see NonStationaryMABEnvironment)
+    stationary = True
+    
+    def __init__(self, n_arms: int, reward_distributions: Union[List[Dict], RewardSpec] = None, seed: int = None,
+                 reward_block_size: int = None, rng: np.random.Generator = None):
         """
         Initialize MAB environment
         
         Args:
             n_arms: Number of arms/actions
-            reward_distributions: List of dicts with 'type' and parameters for each arm
-            seed: Random seed for reproducibility
+            reward_distributions: RewardSpec, or list of dicts with 'type' and
+                parameters for each arm (converted to a RewardSpec)
+            seed: Random seed for reproducibility (ignored if rng is given)
+            reward_block_size: If given, pre-sample rewards in blocks of this many
+                draws per arm, each arm from its own random stream (see pull)
+            rng: Random generator owned by this environment. The global
+                numpy/random state is never touched, so environments can run
+                side by side in threads or processes
         """
         self.n_arms = n_arms
         self.seed = seed
-        if seed is not None:
-            np.random.seed(seed)
-            random.seed(seed)
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
             
         # Default to Bernoulli distributions if none provided
         if reward_distributions is None:
-            self.reward_distributions = [
-                {'type': 'bernoulli', 'p': np.random.uniform(0.1, 0.9)} 
-                for _ in range(n_arms)
-            ]
+            reward_distributions = RewardSpec.bernoulli(self.rng.uniform(0.1, 0.9, size=n_arms))
+        # Stored columnar as self.reward_spec (see the reward_distributions setter)
+        self.reward_distributions = reward_distributions
+        
+        # Pre-sampled reward blocks, refilled lazily per arm
+        self.reward_block_size = reward_block_size
+        if reward_block_size is not None:
+            self._arm_seeds = np.random.SeedSequence(self.rng.integers(2**63)).spawn(n_arms)
+            self._reward_buffer = np.empty((n_arms, reward_block_size))
+            self.reset()
+        
+    @property
+    def reward_distributions(self) -> List[Dict]:
+        """
+        Per-arm distributions as a list of dicts
+        
+        Returns a copy: arms are sampled from self.reward_spec, so mutating the
+        returned dicts does not change them. Assign a new list (or RewardSpec)
+        to reward_distributions instead.
+        """
+        if self._reward_dicts is None:
+            self._reward_dicts = self.reward_spec.to_dicts()
+        return [dict(dist) for dist in self._reward_dicts]
+    
+    @reward_distributions.setter
+    def reward_distributions(self, reward_distributions: Union[List[Dict], RewardSpec]):
+        if isinstance(reward_distributions, RewardSpec):
+            self.reward_spec = reward_distributions
+            self._reward_dicts = None
         else:
-            self.reward_distributions = reward_distributions
+            self.reward_spec = RewardSpec.from_dicts(reward_distributions)
+            self._reward_dicts = [dict(dist) for dist in reward_distributions]
+        if len(self.reward_spec) != self.n_arms:
+            raise ValueError(f"Got {len(self.reward_spec)} reward distributions for {self.n_arms} arms")
             
-        # Track true expected rewards
+        # Track true expected rewards and the per-arm regret they imply
         self.true_expected_rewards = self._compute_expected_rewards()
-        
-    def _compute_expected_rewards(self) -> List[float]:
+        self._update_gaps()
+    
+    def _compute_expected_rewards(self) -> np.ndarray:
         """Compute true expected rewards for each arm"""
-        expected_rewards = []
-        for dist in self.reward_distributions:
-            if dist['type'] == 'bernoulli':
-                expected_rewards.append(dist['p'])
-            elif dist['type'] == 'normal':
-                expected_rewards.append(dist['mu'])
-            elif dist['type'] == 'uniform':
-                expected_rewards.append((dist['low'] + dist['high']) / 2)
-        return expected_rewards
+        return self.reward_spec.expected_rewards()
+    
+    def _update_gaps(self):
+        """
+        Cache the optimal arm, optimal reward and per-arm gap vector
+        
+        gaps[arm] is the regret of one pull of arm. Call again after changing
+        true_expected_rewards.
+        """
+        expected = np.asarray(self.true_expected_rewards, dtype=float)
+        self.optimal_arm = int(np.argmax(expected))
+        self.optimal_reward = float(expected[self.optimal_arm])
+        self.gaps = self.optimal_reward - expected
+    
+    def _refill(self, arm: int):
+        """Draw the next block of rewards for one arm"""
+        self._reward_buffer[arm] = self.reward_spec.sample_arm(arm, self._arm_rngs[arm], self.reward_block_size)
+        self._reward_cursor[arm] = 0
+    
+    def reset(self):
+        """
+        Rewind the pre-sampled reward streams
+        
+        Every run started after a reset sees the same reward sequence on each
+        arm (common random numbers), so comparisons between algorithms are not
+        blurred by reward noise. Does nothing without reward_block_size.
+        """
+        if self.reward_block_size is None:
+            return
+        self._arm_rngs = [np.random.default_rng(arm_seed) for arm_seed in self._arm_seeds]
+        # Cursors start at the end of the block so buffers fill on first pull
+        self._reward_cursor = np.full(self.n_arms, self.reward_block_size)
     
     def pull(self, arm: int) -> float:
         """
         Pull an arm and get reward
         
+        With reward_block_size set, the reward is read from the arm's
+        pre-sampled block instead of being drawn on the spot.
+        
         Args:
             arm: Arm index to pull
             
@@ -58,25 +121,74 @@ class MABEnvironment:
         if arm < 0 or arm >= self.n_arms:
             raise ValueError(f"Invalid arm {arm}. Must be 0 <= arm < {self.n_arms}")
             
-        dist = self.reward_distributions[arm]
+        if self.reward_block_size is not None:
+            if self._reward_cursor[arm] == self.reward_block_size:
+                self._refill(arm)
+            reward = self._reward_buffer[arm, self._reward_cursor[arm]]
+            self._reward_cursor[arm] += 1
+            return reward
+            
+        return self.reward_spec.sample_arm(arm, self.rng)
+    
+    def pull_batch(self, arms: np.ndarray) -> np.ndarray:
+        """
+        Pull one arm for each of many independent runs
         
-        if dist['type'] == 'bernoulli':
-            return np.random.binomial(1, dist['p'])
-        elif dist['type'] == 'normal':
-            return np.random.normal(dist['mu'], dist['sigma'])
-        elif dist['type'] == 'uniform':
-            return np.random.uniform(dist['low'], dist['high'])
-        else:
-            raise ValueError(f"Unknown distribution type: {dist['type']}")
+        Arms of the same distribution family are sampled in one vectorized draw.
+        
+        Args:
+            arms: Array of arm indices, one per run
+            
+        Returns:
+            Array of rewards with the same shape as arms
+        """
+        arms = np.asarray(arms)
+        if np.any((arms < 0) | (arms >= self.n_arms)):
+            raise ValueError(f"Invalid arms in batch. Must be 0 <= arm < {self.n_arms}")
+            
+        return self.reward_spec.sample(arms, self.rng)
+    
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Arm parameters and random state: arrays plus JSON-serialisable scalars
+        
+        Includes the pre-sampled reward blocks and per-arm generators in
+        block mode, so a restored environment continues the same reward
+        sequence.
+        """
+        state = {'type_codes': self.reward_spec.type_codes, 'rng': self.rng.bit_generator.state}
+        for name, values in self.reward_spec.params.items():
+            state[f'params.{name}'] = values
+        if self.reward_block_size is not None:
+            state['reward_buffer'] = self._reward_buffer
+            state['reward_cursor'] = self._reward_cursor
+            state['arm_rngs'] = [arm_rng.bit_generator.state for arm_rng in self._arm_rngs]
+        return state
+    
+    def set_state(self, state: Dict[str, Any]):
+        """Restore state from get_state() (arrays are adopted, not copied)"""
+        prefix = 'params.'
+        params = {key[len(prefix):]: value for key, value in state.items() if key.startswith(prefix)}
+        # Refill the existing gaps array so track_regret() references stay valid
+        gaps = self.gaps
+        self.reward_distributions = RewardSpec(state['type_codes'], params)
+        gaps[:] = self.gaps
+        self.gaps = gaps
+        self.rng.bit_generator.state = state['rng']
+        if self.reward_block_size is not None:
+            self._reward_buffer = state['reward_buffer']
+            self._reward_cursor = state['reward_cursor']
+            for arm_rng, arm_state in zip(self._arm_rngs, state['arm_rngs']):
+                arm_rng.bit_generator.state = arm_state
     
     def get_optimal_arm(self) -> int:
         """Get the arm with highest expected reward"""
-        return np.argmax(self.true_expected_rewards)
+        return self.optimal_arm
     
     def get_optimal_reward(self) -> float:
         """Get the optimal expected reward"""
-        return max(self.true_expected_rewards)
+        return self.optimal_reward
     
     def get_regret(self, arm: int) -> float:
         """Get regret for pulling a specific arm"""
-        return self.get_optimal_reward() - self.true_expected_rewards[arm] 
\ No newline at end of file
+        return self.gaps[arm] 
\ No newline at end of file
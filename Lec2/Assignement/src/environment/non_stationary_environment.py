@@ -0,0 +1,136 @@
+import numpy as np
+from typing import List, Dict, Any, Union
+from environment.mab_environment import MABEnvironment
+from environment.reward_spec import RewardSpec
+
+class NonStationaryMABEnvironment(MABEnvironment):
+    """
+    Multi-Armed Bandit Environment whose arms change over time
+    
+    Time advances by one trial per pull (per pull_batch call for batched
+    runs). Two kinds of change are supported and can be combined:
+    
+    - piecewise: change_points maps a trial index to the reward distributions
+      that take effect from that trial on
+    - drift: before every trial after the first, each arm's location
+      parameter (p, mu, or both low and high) takes a Gaussian random-walk step
+      of standard deviation drift_std; Bernoulli p is clipped to [0, 1]
+    
+    Changes are applied before the pull, so after pull(arm) returns,
+    gaps[arm] is the regret of that pull. The gaps array is updated in place,
+    so algorithms tracking regret against it (track_regret) stay in sync.
+    """
+    stationary = False
+    
+    def __init__(self, n_arms: int, reward_distributions: Union[List[Dict], RewardSpec] = None, seed: int = None,
+                 change_points: Dict[int, Union[List[Dict], RewardSpec]] = None, drift_std: float = 0.0,
+                 rng: np.random.Generator = None, reward_block_size: int = None):
+        """
+        Initialize non-stationary MAB environment
+        
+        Args:
+            n_arms: Number of arms/actions
+            reward_distributions: Distributions in effect from trial 0 (random
+                Bernoulli arms if None)
+            seed: Random seed for reproducibility (ignored if rng is given)
+            change_points: Trial index -> distributions from that trial on
+            drift_std: Standard deviation of the per-trial parameter drift
+            rng: Random generator owned by this environment
+            reward_block_size: Not supported; pre-sampled reward blocks assume
+                fixed arm parameters
+        """
+        if reward_block_size is not None:
+            raise ValueError("Pre-sampled reward blocks require a stationary environment")
+        if drift_std < 0:
+            raise ValueError(f"drift_std must be >= 0, got {drift_std}")
+        super().__init__(n_arms, reward_distributions, seed=seed, rng=rng)
+        
+        self.drift_std = drift_std
+        self.change_points = {
+            trial: dists if isinstance(dists, RewardSpec) else RewardSpec.from_dicts(dists)
+            for trial, dists in (change_points or {}).items()
+        }
+        for trial, spec in self.change_points.items():
+            if len(spec) != n_arms:
+                raise ValueError(f"Got {len(spec)} reward distributions for {n_arms} arms at trial {trial}")
+        
+        self._initial_spec = self.reward_spec
+        self.reset()
+    
+    def _update_gaps(self):
+        """Recompute optimal arm and gaps, writing into the existing gaps array"""
+        gaps = getattr(self, 'gaps', None)
+        super()._update_gaps()
+        if gaps is not None:
+            gaps[:] = self.gaps
+            self.gaps = gaps
+    
+    def _set_spec(self, spec: RewardSpec):
+        """Switch to a private copy of spec (drift modifies it in place)"""
+        self.reward_distributions = RewardSpec(spec.type_codes, spec.params)
+    
+    def _drift(self):
+        """Move every arm's location parameter one random-walk step"""
+        params = self.reward_spec.params
+        steps = self.rng.normal(0.0, self.drift_std, self.n_arms)
+        for family, arms in self.reward_spec.family_arms.items():
+            if family == 'bernoulli':
+                params['p'][arms] = np.clip(params['p'][arms] + steps[arms], 0.0, 1.0)
+            elif family == 'normal':
+                params['mu'][arms] += steps[arms]
+            else:
+                params['low'][arms] += steps[arms]
+                params['high'][arms] += steps[arms]
+        self._reward_dicts = None
+        self.true_expected_rewards = self._compute_expected_rewards()
+        self._update_gaps()
+    
+    def _advance(self):
+        """Apply the changes scheduled for the current trial, then move to the next"""
+        if self.trial in self.change_points:
+            self._set_spec(self.change_points[self.trial])
+        elif self.drift_std > 0 and self.trial > 0:
+            self._drift()
+        self.trial += 1
+    
+    def reset(self):
+        """Go back to trial 0 and the initial distributions"""
+        self.trial = 0
+        self._set_spec(self._initial_spec)
+    
+    def get_state(self) -> Dict[str, Any]:
+        """Current (possibly drifted) arm parameters, trial and random state"""
+        return {**super().get_state(), 'trial': self.trial}
+    
+    def set_state(self, state: Dict[str, Any]):
+        """Restore state from get_state(); change_points come from the constructor"""
+        super().set_state(state)
+        self.trial = state['trial']
+    
+    def pull(self, arm: int) -> float:
+        """
+        Advance one trial, then pull an arm
+        
+        Args:
+            arm: Arm index to pull
+        
+        Returns:
+            Reward from the arm
+        """
+        if arm < 0 or arm >= self.n_arms:
+            raise ValueError(f"Invalid arm {arm}. Must be 0 <= arm < {self.n_arms}")
+        self._advance()
+        return super().pull(arm)
+    
+    def pull_batch(self, arms: np.ndarray) -> np.ndarray:
+        """
+        Advance one trial, then pull one arm for each of many independent runs
+        
+        Args:
+            arms: Array of arm indices, one per run
+        
+        Returns:
+            Array of rewards with the same shape as arms
+        """
+        self._advance()
+        return super().pull_batch(arms)
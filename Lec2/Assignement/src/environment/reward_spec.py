@@ -0,0 +1,158 @@
+import numpy as np
+from typing import List, Dict, Union
+
+# Supported distribution families, indexed by type code
+FAMILIES = ('bernoulli', 'normal', 'uniform')
+BERNOULLI, NORMAL, UNIFORM = range(len(FAMILIES))
+
+# Parameters of each family
+FAMILY_PARAMS = {
+    'bernoulli': ('p',),
+    'normal': ('mu', 'sigma'),
+    'uniform': ('low', 'high')
+}
+PARAM_NAMES = ('p', 'mu', 'sigma', 'low', 'high')
+
+class RewardSpec:
+    """
+    Columnar (struct-of-arrays) description of per-arm reward distributions
+    
+    Arm i has family FAMILIES[type_codes[i]] and its parameters at index i of
+    the arrays in params (NaN where a parameter does not apply). Arms of one
+    family can therefore be sampled in a single vectorized draw, and large
+    environments need no per-arm Python objects.
+    """
+    def __init__(self, type_codes: np.ndarray, params: Dict[str, np.ndarray]):
+        """
+        Args:
+            type_codes: Family code of each arm (index into FAMILIES)
+            params: Parameter name -> per-arm array; missing names are all NaN
+        """
+        self.type_codes = np.asarray(type_codes, dtype=np.int8)
+        self.n_arms = len(self.type_codes)
+        if np.any((self.type_codes < 0) | (self.type_codes >= len(FAMILIES))):
+            raise ValueError(f"Type codes must be in [0, {len(FAMILIES)})")
+        
+        self.params = {}
+        for name in PARAM_NAMES:
+            values = params.get(name)
+            if values is None:
+                self.params[name] = np.full(self.n_arms, np.nan)
+            else:
+                self.params[name] = np.broadcast_to(np.asarray(values, dtype=float), (self.n_arms,)).copy()
+        
+        # Arm indices of every family present
+        self.family_arms = {
+            FAMILIES[code]: np.flatnonzero(self.type_codes == code)
+            for code in np.unique(self.type_codes).tolist()
+        }
+    
+    @classmethod
+    def from_dicts(cls, distributions: List[Dict]) -> 'RewardSpec':
+        """Convert the list-of-dicts format ({'type': ..., <params>}) to columns"""
+        n_arms = len(distributions)
+        type_codes = np.empty(n_arms, dtype=np.int8)
+        params = {name: np.full(n_arms, np.nan) for name in PARAM_NAMES}
+        for arm, dist in enumerate(distributions):
+            if dist['type'] not in FAMILY_PARAMS:
+                raise ValueError(f"Unknown distribution type: {dist['type']}")
+            type_codes[arm] = FAMILIES.index(dist['type'])
+            for name in FAMILY_PARAMS[dist['type']]:
+                params[name][arm] = dist[name]
+        return cls(type_codes, params)
+    
+    @classmethod
+    def bernoulli(cls, p: np.ndarray) -> 'RewardSpec':
+        """All-Bernoulli arms with success probabilities p"""
+        p = np.asarray(p, dtype=float)
+        return cls(np.full(len(p), BERNOULLI), {'p': p})
+    
+    @classmethod
+    def normal(cls, mu: np.ndarray, sigma: Union[float, np.ndarray]) -> 'RewardSpec':
+        """All-Normal arms with means mu and standard deviations sigma"""
+        mu = np.asarray(mu, dtype=float)
+        return cls(np.full(len(mu), NORMAL), {'mu': mu, 'sigma': sigma})
+    
+    @classmethod
+    def uniform(cls, low: np.ndarray, high: np.ndarray) -> 'RewardSpec':
+        """All-Uniform arms on [low, high)"""
+        low = np.asarray(low, dtype=float)
+        return cls(np.full(len(low), UNIFORM), {'low': low, 'high': high})
+    
+    def __len__(self) -> int:
+        return self.n_arms
+    
+    def to_dicts(self) -> List[Dict]:
+        """Convert back to the list-of-dicts format"""
+        distributions = []
+        for arm, code in enumerate(self.type_codes.tolist()):
+            family = FAMILIES[code]
+            dist = {'type': family}
+            for name in FAMILY_PARAMS[family]:
+                dist[name] = float(self.params[name][arm])
+            distributions.append(dist)
+        return distributions
+    
+    def expected_rewards(self) -> np.ndarray:
+        """True expected reward of every arm"""
+        expected = np.empty(self.n_arms)
+        for family, arms in self.family_arms.items():
+            expected[arms] = self._mean(family, arms)
+        return expected
+    
+    def _mean(self, family: str, arms: np.ndarray) -> np.ndarray:
+        params = self.params
+        if family == 'bernoulli':
+            return params['p'][arms]
+        elif family == 'normal':
+            return params['mu'][arms]
+        return (params['low'][arms] + params['high'][arms]) / 2
+    
+    def _draw(self, family: str, arms, rng, size=None):
+        """Draw from the given arms of one family (parameters broadcast against size)"""
+        params = self.params
+        if family == 'bernoulli':
+            return rng.binomial(1, params['p'][arms], size)
+        elif family == 'normal':
+            return rng.normal(params['mu'][arms], params['sigma'][arms], size)
+        return rng.uniform(params['low'][arms], params['high'][arms], size)
+    
+    def sample_arm(self, arm: int, rng, size: int = None):
+        """Draw reward(s) from a single arm"""
+        return self._draw(FAMILIES[self.type_codes[arm]], arm, rng, size)
+    
+    def sample(self, arms: np.ndarray, rng) -> np.ndarray:
+        """
+        Draw one reward for each entry of arms, one vectorized draw per family
+        
+        Args:
+            arms: Array of arm indices (repeats allowed)
+            rng: Random generator
+        
+        Returns:
+            Array of rewards with the same shape as arms
+        """
+        arms = np.asarray(arms)
+        if len(self.family_arms) == 1:
+            (family,) = self.family_arms
+            return np.asarray(self._draw(family, arms, rng), dtype=float)
+        
+        codes = self.type_codes[arms]
+        rewards = np.empty(arms.shape)
+        for family in self.family_arms:
+            mask = codes == FAMILIES.index(family)
+            if mask.any():
+                rewards[mask] = self._draw(family, arms[mask], rng)
+        return rewards
+    
+    def sample_all(self, rng, size: int) -> np.ndarray:
+        """
+        Draw size rewards from every arm, one vectorized draw per family
+        
+        Returns:
+            Array of shape (n_arms, size)
+        """
+        rewards = np.empty((self.n_arms, size))
+        for family, arms in self.family_arms.items():
+            rewards[arms] = self._draw(family, arms[:, None], rng, (len(arms), size))
+        return rewards
@@ -1,29 +1,97 @@
+import os
+import time
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import List, Dict, Any, Callable, Sequence
 from environment.mab_environment import MABEnvironment
+from environment.reward_spec import RewardSpec
+from environment.contextual_environment import ContextualMABEnvironment
 from algorithms.base_algorithm import BaseMABAlgorithm
+from algorithms.lin_ucb import LinUCB
 from utils.config import MABConfig
+from utils.decimation import DECIMATORS, RunningMean
+from utils.checkpoint import checkpoint_exists, save_checkpoint, restore_checkpoint
+from experiments import kernels
+from experiments.profiling import PhaseProfiler, PHASES
+
+# Record layout of streamed results files
+RESULT_DTYPE = np.dtype([('arm', np.int32), ('reward', np.float32), ('regret', np.float32)])
+
+def _run_seed_job(config: MABConfig, reward_distributions: RewardSpec, algorithm: BaseMABAlgorithm,
+                  seed_seq: np.random.SeedSequence, n_trials: int) -> Dict[str, Any]:
+    """
+    Run one (algorithm, seed) job of a parallel comparison
+    
+    Runs in a worker process. The environment and the algorithm each get
+    their own Generator from independent children of seed_seq.
+    """
+    env_seq, algorithm_seq = seed_seq.spawn(2)
+    environment = MABEnvironment(
+        n_arms=config.n_arms,
+        reward_distributions=reward_distributions,
+        reward_block_size=config.reward_block_size,
+        rng=np.random.default_rng(env_seq)
+    )
+    algorithm.rng = np.random.default_rng(algorithm_seq)
+    runner = MABExperimentRunner(config, environment=environment)
+    return runner.run_experiment(algorithm, n_trials)
 
 class MABExperimentRunner:
     """
     Main experiment runner for MAB algorithms
     """
-    def __init__(self, config: MABConfig):
+    def __init__(self, config: MABConfig, environment: MABEnvironment = None):
         self.config = config
-        self.environment = MABEnvironment(
-            n_arms=config.n_arms,
-            reward_distributions=config.reward_distributions,
-            seed=config.seed
-        )
+        if environment is None:
+            environment = MABEnvironment(
+                n_arms=config.n_arms,
+                reward_distributions=config.reward_distributions,
+                seed=config.seed,
+                reward_block_size=config.reward_block_size
+            )
+        self.environment = environment
         
-    def run_experiment(self, algorithm: BaseMABAlgorithm, n_trials: int = None) -> Dict[str, Any]:
+    def run_experiment(self, algorithm: BaseMABAlgorithm, n_trials: int = None, stream_path: str = None,
+                       callback: Callable[[Dict[str, Any]], None] = None,
+                       chunk_size: int = 65536, checkpoint_path: str = None, checkpoint_every: int = None,
+                       resume: bool = False, profiler: PhaseProfiler = None) -> Dict[str, Any]:
         """
         Run a single experiment with the given algorithm
         
+        Results are kept in preallocated typed arrays (int32 arms, float32
+        rewards and cumulative regret). For long horizons the run can be
+        streamed in chunks of chunk_size trials, keeping memory constant:
+        
+        - stream_path: chunks are written to a memory-mapped .npy file with
+          fields 'arm', 'reward' and 'regret'; the returned arrays are views
+          of that file
+        - callback: called after every chunk with a dict holding 'start' (index
+          of the chunk's first trial) and 'arm_history', 'rewards' and
+          'regrets' for the chunk. The arrays are reused for the next chunk,
+          so copy them to keep them. Without stream_path, the returned
+          arrays hold only the last chunk
+        
+        With checkpoint_path, results are streamed to results.npy in that
+        directory (unless stream_path is given) and the algorithm and
+        environment state is saved there every checkpoint_every trials. A
+        run started with resume=True continues from the last checkpoint and
+        produces the same results as an uninterrupted run.
+        
+        With a profiler, a sample of trials is timed phase by phase (see
+        experiments.profiling); results are unchanged.
+        
         Args:
             algorithm: Algorithm to test
             n_trials: Number of trials (uses config if None)
+            stream_path: Path of a .npy file to stream results into (optional)
+            callback: Function receiving each chunk of results (optional)
+            chunk_size: Number of trials per chunk when streaming
+            checkpoint_path: Checkpoint directory (optional)
+            checkpoint_every: Trials between checkpoints (default: one chunk)
+            resume: Continue from the checkpoint in checkpoint_path, if any
+            profiler: PhaseProfiler recording per-phase timings (optional)
             
         Returns:
             Dictionary with experiment results
@@ -31,31 +99,110 @@ class MABExperimentRunner:
         if n_trials is None:
             n_trials = self.config.n_trials
             
-        # Reset algorithm
-        algorithm.reset()
+        if checkpoint_path is not None and stream_path is None:
+            os.makedirs(checkpoint_path, exist_ok=True)
+            stream_path = os.path.join(checkpoint_path, 'results.npy')
         
-        # Track results
-        rewards = []
-        regrets = []
-        arm_history = []
-        cumulative_regret = 0
+        start_trial = 0
+        cumulative_regret = 0.0
+        if resume and checkpoint_path is not None and checkpoint_exists(checkpoint_path):
+            checkpoint = restore_checkpoint(checkpoint_path, algorithm, self.environment)
+            extra = checkpoint['extra']
+            if extra['n_trials'] != n_trials or extra['chunk_size'] != chunk_size:
+                raise ValueError(f"Checkpoint was saved for n_trials={extra['n_trials']}, "
+                                 f"chunk_size={extra['chunk_size']}")
+            start_trial = checkpoint['trial']
+            cumulative_regret = extra['cumulative_regret']
+        else:
+            # Reset algorithm and rewind pre-sampled rewards
+            algorithm.reset()
+            self.environment.reset()
         
-        for trial in range(n_trials):
-            # Select arm
-            arm = algorithm.select_arm()
-            arm_history.append(arm)
-            
-            # Get reward
-            reward = self.environment.pull(arm)
-            rewards.append(reward)
+        # Track results in one buffer for the whole run, or one chunk at a time
+        streaming = stream_path is not None or callback is not None
+        buffer_size = max(1, min(chunk_size, n_trials)) if streaming else n_trials
+        # Gaps of a non-stationary environment change (in place) as it advances
+        gaps = self.environment.gaps.tolist() if self.environment.stationary else self.environment.gaps
+        arm_history = np.empty(buffer_size, dtype=np.int32)
+        rewards = np.empty(buffer_size, dtype=np.float32)
+        regrets = np.empty(buffer_size, dtype=np.float32)
+        
+        storage = None
+        if stream_path is not None:
+            if start_trial > 0:
+                storage = np.lib.format.open_memmap(stream_path, mode='r+')
+            else:
+                storage = np.lib.format.open_memmap(stream_path, mode='w+', dtype=RESULT_DTYPE,
+                                                    shape=(n_trials,))
+        
+        if checkpoint_path is not None:
+            checkpoint_every = checkpoint_every or buffer_size
+            next_checkpoint = start_trial + checkpoint_every
+        else:
+            next_checkpoint = -1
+        
+        select_arm, pull, update = algorithm.select_arm, self.environment.pull, algorithm.update
+        if profiler is not None:
+            select_arm, pull, update = profiler.instrument(algorithm, self.environment)
+        
+        # A resumed run restarts inside the chunk holding start_trial
+        first_chunk = start_trial - start_trial % buffer_size
+        n_chunk = 0
+        for start in range(first_chunk, n_trials, buffer_size):
+            n_chunk = min(buffer_size, n_trials - start)
+            first = start_trial - start if start < start_trial else 0
+            if first > 0 and storage is not None:
+                arm_history[:first] = storage['arm'][start:start_trial]
+                rewards[:first] = storage['reward'][start:start_trial]
+                regrets[:first] = storage['regret'][start:start_trial]
             
-            # Update algorithm
-            algorithm.update(arm, reward)
+            for trial in range(first, n_chunk):
+                # Select arm
+                arm = select_arm()
+                arm_history[trial] = arm
+                
+                # Get reward
+                reward = pull(arm)
+                rewards[trial] = reward
+                
+                # Update algorithm
+                update(arm, reward)
+                
+                # Calculate regret (accumulated in double precision)
+                cumulative_regret += gaps[arm]
+                regrets[trial] = cumulative_regret
+                
+                if start + trial + 1 == next_checkpoint:
+                    # Results up to the checkpoint must be on disk before the state
+                    stop = trial + 1
+                    storage['arm'][start + first:start + stop] = arm_history[first:stop]
+                    storage['reward'][start + first:start + stop] = rewards[first:stop]
+                    storage['regret'][start + first:start + stop] = regrets[first:stop]
+                    storage.flush()
+                    first = stop
+                    save_checkpoint(checkpoint_path, start + stop, algorithm, self.environment,
+                                    extra={'cumulative_regret': cumulative_regret, 'n_trials': n_trials,
+                                           'chunk_size': chunk_size})
+                    next_checkpoint += checkpoint_every
             
-            # Calculate regret
-            regret = self.environment.get_regret(arm)
-            cumulative_regret += regret
-            regrets.append(cumulative_regret)
+            if storage is not None:
+                stop = start + n_chunk
+                storage['arm'][start + first:stop] = arm_history[first:n_chunk]
+                storage['reward'][start + first:stop] = rewards[first:n_chunk]
+                storage['regret'][start + first:stop] = regrets[first:n_chunk]
+            if callback is not None:
+                callback({
+                    'start': start,
+                    'arm_history': arm_history[:n_chunk],
+                    'rewards': rewards[:n_chunk],
+                    'regrets': regrets[:n_chunk]
+                })
+        
+        if storage is not None:
+            storage.flush()
+            arm_history, rewards, regrets = storage['arm'], storage['reward'], storage['regret']
+        elif streaming:
+            arm_history, rewards, regrets = arm_history[:n_chunk], rewards[:n_chunk], regrets[:n_chunk]
         
         return {
             'rewards': rewards,
@@ -67,37 +214,360 @@ class MABExperimentRunner:
             'estimated_optimal_arm': algorithm.get_estimated_optimal_arm()
         }
     
-    def compare_algorithms(self, algorithms: Dict[str, BaseMABAlgorithm]) -> Dict[str, Dict]:
+    def run_compiled_experiment(self, algorithm: BaseMABAlgorithm, n_trials: int = None,
+                                chunk_size: int = 65536) -> Dict[str, Any]:
+        """
+        Run a single experiment through the compiled simulation kernel
+        
+        The whole trial loop runs in one numba-compiled kernel call per chunk,
+        without per-step Python dispatch. Supports the built-in
+        ExplorationOnly, ExploitationOnly, EpsilonGreedy and UCB. Without
+        numba the kernel would be a scalar Python loop, slower than
+        run_experiment, so the experiment runs through run_experiment instead
+        (same inputs accepted, different random draws).
+        
+        Args:
+            algorithm: Algorithm to test
+            n_trials: Number of trials (uses config if None)
+            chunk_size: Number of trials per kernel call
+            
+        Returns:
+            Dictionary with experiment results, as from run_experiment
+        """
+        if n_trials is None:
+            n_trials = self.config.n_trials
+        if kernels.numba is None:
+            kernels.check_supported(algorithm, self.environment)
+            return self.run_experiment(algorithm, n_trials)
+        return kernels.simulate(algorithm, self.environment, n_trials, chunk_size)
+    
+    def run_delayed_feedback_experiment(self, algorithm: BaseMABAlgorithm, n_trials: int = None,
+                                        delay: int = 0, batch_size: int = 1) -> Dict[str, Any]:
+        """
+        Run a single experiment where rewards arrive late and in bulk
+        
+        Trials are processed in windows of batch_size. At the start of each
+        window, every reward observed at least delay trials before is handed
+        to algorithm.ingest() in one call; the window's decisions are then
+        made together with algorithm.select_arms(), since the algorithm's
+        state cannot change until the next delivery. Observations still
+        undelivered after the last trial are ingested at the end, so the
+        final estimates and pulls cover the whole run. delay=0, batch_size=1
+        is the usual online setting.
+        
+        Args:
+            algorithm: Algorithm to test
+            n_trials: Number of trials (uses config if None)
+            delay: Number of trials before an observation can be delivered
+            batch_size: Number of trials between deliveries
+        
+        Returns:
+            Dictionary with experiment results, as from run_experiment, plus
+            'elapsed' (seconds), 'trials_per_sec' and 'n_ingests'
+        """
+        if n_trials is None:
+            n_trials = self.config.n_trials
+        if delay < 0 or batch_size < 1:
+            raise ValueError("delay must be >= 0 and batch_size >= 1")
+        
+        # Reset algorithm and rewind pre-sampled rewards
+        algorithm.reset()
+        self.environment.reset()
+        
+        arm_history = np.empty(n_trials, dtype=np.int32)
+        rewards = np.empty(n_trials, dtype=np.float32)
+        step_regrets = np.empty(n_trials)
+        gaps = self.environment.gaps
+        delivered = 0
+        n_ingests = 0
+        
+        start_time = time.perf_counter()
+        for start in range(0, n_trials, batch_size):
+            # Deliver everything observed at trial t <= start - 1 - delay
+            ready = max(0, start - delay)
+            if ready > delivered:
+                algorithm.ingest(arm_history[delivered:ready], rewards[delivered:ready])
+                delivered = ready
+                n_ingests += 1
+        
+            stop = min(start + batch_size, n_trials)
+            arms = algorithm.select_arms(stop - start)
+            arm_history[start:stop] = arms
+            if self.environment.stationary and self.environment.reward_block_size is None:
+                rewards[start:stop] = self.environment.pull_batch(arms)
+                step_regrets[start:stop] = gaps[arms]
+            else:
+                # One trial per pull: per-arm reward blocks (common random
+                # numbers) or arms that change over time
+                for trial, arm in enumerate(arms.tolist(), start):
+                    rewards[trial] = self.environment.pull(arm)
+                    step_regrets[trial] = gaps[arm]
+        
+        # Deliver what is still held back (the last window and the delay)
+        if n_trials > delivered:
+            algorithm.ingest(arm_history[delivered:], rewards[delivered:])
+            n_ingests += 1
+        elapsed = time.perf_counter() - start_time
+        
+        regrets = np.cumsum(step_regrets).astype(np.float32)
+        
+        return {
+            'rewards': rewards,
+            'regrets': regrets,
+            'arm_history': arm_history,
+            'final_estimates': algorithm.estimates.copy(),
+            'final_pulls': algorithm.pulls.copy(),
+            'optimal_arm': self.environment.get_optimal_arm(),
+            'estimated_optimal_arm': algorithm.get_estimated_optimal_arm(),
+            'elapsed': elapsed,
+            'trials_per_sec': n_trials / elapsed if elapsed > 0 else float('inf'),
+            'n_ingests': n_ingests
+        }
+    
+    def run_contextual_experiment(self, algorithm: LinUCB, environment: ContextualMABEnvironment,
+                                  n_trials: int = None) -> Dict[str, Any]:
+        """
+        Run a single contextual bandit experiment
+        
+        Every trial observes a context, selects an arm for it, pulls and
+        updates with the same context. The optimal arm changes from trial to
+        trial, so regret is measured against each trial's best arm.
+        
+        Args:
+            algorithm: Contextual algorithm (select_arm/update take the context)
+            environment: Contextual environment to run in
+            n_trials: Number of trials (uses config if None)
+        
+        Returns:
+            Dictionary with 'rewards', 'regrets', 'arm_history', 'final_pulls'
+            and 'optimal_rate' (fraction of trials that pulled the best arm)
+        """
+        if n_trials is None:
+            n_trials = self.config.n_trials
+        
+        algorithm.reset()
+        environment.reset()
+        
+        arm_history = np.empty(n_trials, dtype=np.int32)
+        rewards = np.empty(n_trials, dtype=np.float32)
+        regrets = np.empty(n_trials, dtype=np.float32)
+        cumulative_regret = 0.0
+        n_optimal = 0
+        
+        for trial in range(n_trials):
+            contexts = environment.observe()
+            arm = algorithm.select_arm(contexts)
+            reward = environment.pull(arm)
+            algorithm.update(arm, reward, contexts)
+            
+            arm_history[trial] = arm
+            rewards[trial] = reward
+            cumulative_regret += environment.get_regret(arm)
+            regrets[trial] = cumulative_regret
+            n_optimal += arm == environment.get_optimal_arm()
+        
+        return {
+            'rewards': rewards,
+            'regrets': regrets,
+            'arm_history': arm_history,
+            'final_pulls': algorithm.pulls.copy(),
+            'optimal_rate': n_optimal / n_trials
+        }
+    
+    def run_batch_experiment(self, algorithm: BaseMABAlgorithm, n_runs: int, n_trials: int = None,
+                             quantiles: Sequence[float] = (0.05, 0.5, 0.95)) -> Dict[str, Any]:
+        """
+        Run many independent replications of an experiment at once
+        
+        All runs share the environment's arms but keep their own algorithm state
+        as rows of (n_runs, n_arms) arrays, so each trial is a single vectorized
+        select, pull and update across the whole batch.
+        
+        Args:
+            algorithm: Algorithm to test
+            n_runs: Number of independent runs
+            n_trials: Number of trials per run (uses config if None)
+            quantiles: Quantiles of the cumulative regret to report
+            
+        Returns:
+            Dictionary with per-trial averages over runs and regret quantiles
+        """
+        if n_trials is None:
+            n_trials = self.config.n_trials
+        if self.environment.reward_block_size is not None:
+            raise ValueError("Batched runs draw rewards with pull_batch and do not support pre-sampled "
+                             "reward blocks (reward_block_size); use run_experiment or "
+                             "compare_algorithms_parallel")
+            
+        # Reset algorithm
+        algorithm.reset_batch(n_runs)
+        
+        gaps = self.environment.gaps
+        step_rewards = np.empty((n_runs, n_trials))
+        step_regrets = np.empty((n_runs, n_trials))
+        
+        for trial in range(n_trials):
+            arms = algorithm.select_arm_batch()
+            rewards = self.environment.pull_batch(arms)
+            algorithm.update_batch(arms, rewards)
+            
+            step_rewards[:, trial] = rewards
+            step_regrets[:, trial] = gaps[arms]
+        
+        return self._summarise_runs(np.cumsum(step_regrets, axis=1), step_rewards,
+                                    algorithm.batch_estimates, algorithm.batch_pulls, quantiles)
+    
+    def _summarise_runs(self, regrets: np.ndarray, rewards: np.ndarray, estimates: np.ndarray,
+                        pulls: np.ndarray, quantiles: Sequence[float]) -> Dict[str, Any]:
+        """
+        Average per-run results into a single results dict
+        
+        Args:
+            regrets: Cumulative regret curves, shape (n_runs, n_trials)
+            rewards: Per-trial rewards, shape (n_runs, n_trials)
+            estimates: Final estimates, shape (n_runs, n_arms)
+            pulls: Final pull counts, shape (n_runs, n_arms)
+            quantiles: Quantiles of the cumulative regret to report
+            
+        Returns:
+            Results dict with mean curves plus regret spread across runs
+        """
+        mean_estimates = estimates.mean(axis=0)
+        return {
+            'rewards': rewards.mean(axis=0),
+            'regrets': regrets.mean(axis=0),
+            'regret_std': regrets.std(axis=0),
+            'regret_quantiles': {q: np.quantile(regrets, q, axis=0) for q in quantiles},
+            'final_regrets': regrets[:, -1],
+            'final_estimates': mean_estimates,
+            'final_pulls': pulls.mean(axis=0),
+            'optimal_arm': self.environment.get_optimal_arm(),
+            'estimated_optimal_arm': np.argmax(mean_estimates),
+            'n_runs': len(regrets)
+        }
+    
+    def compare_algorithms(self, algorithms: Dict[str, BaseMABAlgorithm], n_runs: int = None,
+                           backend: str = 'python', profiler: PhaseProfiler = None) -> Dict[str, Dict]:
         """
         Compare multiple algorithms
         
         Args:
             algorithms: Dictionary mapping algorithm names to algorithm instances
+            n_runs: If given, average each algorithm over this many independent
+                runs using the batched engine
+            backend: 'python' for the step-by-step loop or 'compiled' for the
+                simulation kernel (single runs only)
+            profiler: PhaseProfiler timing each algorithm under its name
+                (python backend, single runs only)
             
         Returns:
             Dictionary with results for each algorithm
         """
+        if backend not in ('python', 'compiled'):
+            raise ValueError(f"Unknown backend: {backend}")
+        if profiler is not None and (n_runs is not None or backend != 'python'):
+            raise ValueError("Profiling is only supported for single runs with the python backend")
+            
         results = {}
         
         for name, algorithm in algorithms.items():
             print(f"Running {name}...")
-            results[name] = self.run_experiment(algorithm)
+            if n_runs is not None:
+                results[name] = self.run_batch_experiment(algorithm, n_runs)
+            elif backend == 'compiled':
+                results[name] = self.run_compiled_experiment(algorithm)
+            else:
+                if profiler is not None:
+                    profiler.set_label(name)
+                results[name] = self.run_experiment(algorithm, profiler=profiler)
             
         return results
     
-    def plot_results(self, results: Dict[str, Dict], save_path: str = None):
+    def compare_algorithms_parallel(self, algorithms: Dict[str, BaseMABAlgorithm], n_seeds: int,
+                                    max_workers: int = None, n_trials: int = None,
+                                    quantiles: Sequence[float] = (0.05, 0.5, 0.95)) -> Dict[str, Dict]:
+        """
+        Compare multiple algorithms over many seeds in a process pool
+        
+        Every (algorithm, seed) pair is an independent job. Seeds are spawned
+        from a SeedSequence rooted at config.seed, and seed i is shared by all
+        algorithms, so results do not depend on max_workers or scheduling.
+        
+        Args:
+            algorithms: Dictionary mapping algorithm names to algorithm instances
+            n_seeds: Number of seeds (runs) per algorithm
+            max_workers: Number of worker processes (defaults to CPU count)
+            n_trials: Number of trials per run (uses config if None)
+            quantiles: Quantiles of the cumulative regret to report
+            
+        Returns:
+            Dictionary with results for each algorithm, averaged over seeds as in
+            run_batch_experiment, with the per-seed results under 'runs'
+        """
+        if n_trials is None:
+            n_trials = self.config.n_trials
+        if not self.environment.stationary:
+            raise ValueError("Parallel comparisons rebuild the environment per seed and need a stationary one")
+            
+        seed_seqs = np.random.SeedSequence(self.config.seed).spawn(n_seeds)
+        reward_distributions = self.environment.reward_spec
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                name: [executor.submit(_run_seed_job, self.config, reward_distributions,
+                                       algorithm, seed_seq, n_trials)
+                       for seed_seq in seed_seqs]
+                for name, algorithm in algorithms.items()
+            }
+            
+            results = {}
+            for name, jobs in futures.items():
+                print(f"Collecting {name}...")
+                runs = [job.result() for job in jobs]
+                results[name] = self._summarise_runs(
+                    np.array([run['regrets'] for run in runs]),
+                    np.array([run['rewards'] for run in runs]),
+                    np.array([run['final_estimates'] for run in runs]),
+                    np.array([run['final_pulls'] for run in runs]),
+                    quantiles
+                )
+                results[name]['runs'] = runs
+                
+        return results
+    
+    def plot_results(self, results: Dict[str, Dict], save_path: str = None, max_points: int = 2000,
+                     method: str = 'minmax', log_x: bool = False, confidence: float = 0.95):
         """
         Plot comparison results
         
+        Curves longer than max_points are downsampled (see utils.decimation),
+        so plotting cost does not grow with the horizon. Results averaged over
+        several runs ('regret_std' and 'n_runs', as from run_batch_experiment)
+        get a confidence band around the mean cumulative regret.
+        
         Args:
             results: Results from compare_algorithms
             save_path: Path to save plot (optional)
+            max_points: Maximum number of points drawn per curve
+            method: Downsampling method, 'minmax' or 'lttb'
+            log_x: Use a logarithmic trial axis
+            confidence: Level of the confidence band of the mean regret
         """
+        if method not in DECIMATORS:
+            raise ValueError(f"Unknown decimation method: {method}")
+        decimate = DECIMATORS[method]
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 5))
         
-        # Plot cumulative regret
+        # Plot cumulative regret (trials are numbered from 1 for the log axis)
         for name, result in results.items():
-            ax1.plot(result['regrets'], label=name)
+            indices, regrets = decimate(result['regrets'], max_points, log_x)
+            line, = ax1.plot(indices + 1, regrets, label=name)
+            if 'regret_std' in result and result.get('n_runs', 1) > 1:
+                half_width = z * np.asarray(result['regret_std'][indices]) / np.sqrt(result['n_runs'])
+                ax1.fill_between(indices + 1, regrets - half_width, regrets + half_width,
+                                 color=line.get_color(), alpha=0.2, linewidth=0)
         ax1.set_xlabel('Trial')
         ax1.set_ylabel('Cumulative Regret')
         ax1.set_title('Cumulative Regret Over Time')
@@ -106,14 +576,18 @@ class MABExperimentRunner:
         
         # Plot average reward
         for name, result in results.items():
-            avg_rewards = np.cumsum(result['rewards']) / np.arange(1, len(result['rewards']) + 1)
-            ax2.plot(avg_rewards, label=name)
+            indices, avg_rewards = decimate(RunningMean(result['rewards']), max_points, log_x)
+            ax2.plot(indices + 1, avg_rewards, label=name)
         ax2.set_xlabel('Trial')
         ax2.set_ylabel('Average Reward')
         ax2.set_title('Average Reward Over Time')
         ax2.legend()
         ax2.grid(True)
         
+        if log_x:
+            ax1.set_xscale('log')
+            ax2.set_xscale('log')
+        
         plt.tight_layout()
         
         if save_path:
@@ -133,4 +607,20 @@ class MABExperimentRunner:
             print(f"  Final Average Reward: {np.mean(result['rewards'][-100:]):.3f}")
             print(f"  Optimal Arm: {result['optimal_arm']}")
             print(f"  Estimated Optimal Arm: {result['estimated_optimal_arm']}")
-            print(f"  Arm Pulls: {dict(enumerate(result['final_pulls']))}") 
\ No newline at end of file
+            print(f"  Arm Pulls: {dict(enumerate(result['final_pulls']))}") 
+    
+    def print_profile(self, profiler: PhaseProfiler):
+        """Print per-phase timings recorded by a profiler"""
+        print("\n" + "="*50)
+        print(f"PROFILE (1 in {profiler.sample_every} trials timed)")
+        print("="*50)
+        
+        for name, entry in profiler.report().items():
+            print(f"\n{name.upper()}: {entry['calls']} trials, {entry['sampled_trials']} sampled")
+            print(f"  {'phase':<12} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'est. total s':>13} {'share':>7}")
+            for phase in PHASES:
+                if phase not in entry['phases']:
+                    continue
+                stats = entry['phases'][phase]
+                print(f"  {phase:<12} {stats['mean_us']:>9.2f} {stats['p50_us']:>9.2f} {stats['p99_us']:>9.2f} "
+                      f"{stats['estimated_total_s']:>13.4f} {stats['share']:>7.1%}")
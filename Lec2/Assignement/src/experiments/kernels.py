@@ -0,0 +1,217 @@
+import math
+import numpy as np
+from typing import Dict, Any, Tuple
+from environment.mab_environment import MABEnvironment
+from environment.reward_spec import BERNOULLI, NORMAL, UNIFORM
+from algorithms.base_algorithm import BaseMABAlgorithm
+from algorithms.epsilon_greedy import EpsilonGreedy
+from algorithms.exploitation_only import ExploitationOnly
+from algorithms.exploration_only import ExplorationOnly
+from algorithms.ucb import UCB
+
+try:
+    import numba
+except ImportError:  # Optional (requirements-compiled.txt): without numba the kernel is a plain Python loop
+    numba = None
+
+# Policy codes understood by the kernel
+EXPLORATION_ONLY = 0
+EXPLOITATION_ONLY = 1
+EPSILON_GREEDY = 2
+UCB_POLICY = 3
+
+def _jit(func):
+    """Compile func with numba when it is installed"""
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+@_jit
+def _simulate_chunk(policy, epsilon, c, dist_codes, param_a, param_b, gaps,
+                    pulls, reward_sums, estimates, state,
+                    u_explore, u_arm, u_reward, z_reward,
+                    arm_out, reward_out, regret_out):
+    """
+    Run len(arm_out) bandit steps in one call
+    
+    pulls, reward_sums and estimates are the algorithm's arrays and are
+    updated in place. state holds [total_pulls, cumulative_regret] carried
+    between chunks. u_* / z_reward are pre-drawn uniform / standard normal
+    variates, one per step.
+    """
+    n_arms = pulls.shape[0]
+    total_pulls = state[0]
+    cumulative_regret = state[1]
+    
+    for t in range(arm_out.shape[0]):
+        # Select arm
+        if policy == EXPLORATION_ONLY:
+            arm = min(int(u_arm[t] * n_arms), n_arms - 1)
+        elif policy == EXPLOITATION_ONLY:
+            arm = np.argmax(estimates)
+        elif policy == EPSILON_GREEDY:
+            if u_explore[t] < epsilon:
+                arm = min(int(u_arm[t] * n_arms), n_arms - 1)
+            elif total_pulls == 0:
+                arm = 0
+            else:
+                arm = np.argmax(estimates)
+        else:
+            arm = -1
+            best = -np.inf
+            log_total = math.log(total_pulls) if total_pulls > 0 else 0.0
+            for a in range(n_arms):
+                if pulls[a] == 0:
+                    arm = a
+                    break
+                value = estimates[a] + c * math.sqrt(log_total / pulls[a])
+                if value > best:
+                    best = value
+                    arm = a
+        
+        # Get reward
+        code = dist_codes[arm]
+        if code == BERNOULLI:
+            reward = 1.0 if u_reward[t] < param_a[arm] else 0.0
+        elif code == NORMAL:
+            reward = param_a[arm] + param_b[arm] * z_reward[t]
+        else:
+            reward = param_a[arm] + (param_b[arm] - param_a[arm]) * u_reward[t]
+        
+        # Update algorithm
+        pulls[arm] += 1
+        reward_sums[arm] += reward
+        estimates[arm] = reward_sums[arm] / pulls[arm]
+        total_pulls += 1
+        
+        # Calculate regret
+        cumulative_regret += gaps[arm]
+        arm_out[t] = arm
+        reward_out[t] = reward
+        regret_out[t] = cumulative_regret
+    
+    state[0] = total_pulls
+    state[1] = cumulative_regret
+
+def encode_policy(algorithm: BaseMABAlgorithm) -> Tuple[int, float, float]:
+    """
+    Map an algorithm instance to (policy code, epsilon, c) for the kernel
+    
+    Only the built-in classes with sample-mean estimates are supported;
+    subclasses may change the selection rule, so they are rejected rather
+    than silently approximated.
+    """
+    if algorithm.estimator is not None:
+        raise ValueError("The compiled kernel only supports sample-mean estimates (estimator=None)")
+    policy_type = type(algorithm)
+    if policy_type is ExplorationOnly:
+        return EXPLORATION_ONLY, 0.0, 0.0
+    if policy_type is ExploitationOnly:
+        return EXPLOITATION_ONLY, 0.0, 0.0
+    if policy_type is EpsilonGreedy:
+        return EPSILON_GREEDY, float(algorithm.epsilon), 0.0
+    if policy_type is UCB:
+        return UCB_POLICY, 0.0, float(algorithm.c)
+    raise ValueError(f"No compiled kernel for {policy_type.__name__}")
+
+def encode_distributions(environment: MABEnvironment) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encode the environment's RewardSpec as (codes, param_a, param_b)
+    
+    param_a/param_b are p/unused for Bernoulli, mu/sigma for Normal and
+    low/high for Uniform arms.
+    """
+    spec = environment.reward_spec
+    codes = spec.type_codes.astype(np.int64)
+    params = spec.params
+    param_a = np.select([codes == BERNOULLI, codes == NORMAL], [params['p'], params['mu']], params['low'])
+    param_b = np.select([codes == NORMAL, codes == UNIFORM], [params['sigma'], params['high']], 0.0)
+    return codes, param_a, param_b
+
+def check_supported(algorithm: BaseMABAlgorithm, environment: MABEnvironment):
+    """Raise ValueError unless the kernel can simulate algorithm on environment"""
+    if not environment.stationary:
+        raise ValueError("The compiled kernel assumes fixed arm parameters")
+    if environment.reward_block_size is not None:
+        raise ValueError("The compiled kernel draws its own reward noise; it does not support "
+                         "pre-sampled reward blocks (reward_block_size)")
+    encode_policy(algorithm)
+
+def simulate(algorithm: BaseMABAlgorithm, environment: MABEnvironment, n_trials: int,
+             chunk_size: int = 65536) -> Dict[str, Any]:
+    """
+    Run a whole experiment through the compiled kernel
+    
+    Random variates are drawn in chunks: policy coins from algorithm.rng and
+    reward noise from environment.rng, so runs are reproducible but not
+    draw-for-draw identical to the Python loop. The algorithm's pulls,
+    rewards, estimates and tracked regret (see track_regret) are left in
+    their final state (and any selection index rebuilt from them).
+    Environments with reward_block_size are rejected.
+    
+    Args:
+        algorithm: ExplorationOnly, ExploitationOnly, EpsilonGreedy or UCB
+        environment: Environment providing the arms
+        n_trials: Number of trials
+        chunk_size: Number of steps per kernel call (bounds scratch memory)
+    
+    Returns:
+        Dictionary with experiment results, as from run_experiment
+    """
+    check_supported(algorithm, environment)
+    policy, epsilon, c = encode_policy(algorithm)
+    dist_codes, param_a, param_b = encode_distributions(environment)
+    gaps = np.asarray(environment.gaps, dtype=float)
+    
+    algorithm.reset()
+    environment.reset()
+    pulls = algorithm.pulls.astype(np.int64)
+    reward_sums = algorithm.rewards.astype(float)
+    estimates = algorithm.estimates.astype(float)
+    state = np.zeros(2)
+    
+    arm_history = np.empty(n_trials, dtype=np.int32)
+    rewards = np.empty(n_trials, dtype=np.float32)
+    regrets = np.empty(n_trials, dtype=np.float32)
+    
+    # Scratch buffers reused for every chunk, kept in float64 for the kernel
+    chunk_size = max(1, min(chunk_size, n_trials))
+    arm_chunk = np.empty(chunk_size, dtype=np.int64)
+    reward_chunk = np.empty(chunk_size)
+    regret_chunk = np.empty(chunk_size)
+    
+    for start in range(0, n_trials, chunk_size):
+        n_chunk = min(chunk_size, n_trials - start)
+        u_explore = algorithm.rng.random(n_chunk)
+        u_arm = algorithm.rng.random(n_chunk)
+        u_reward = environment.rng.random(n_chunk)
+        z_reward = environment.rng.standard_normal(n_chunk)
+        
+        _simulate_chunk(policy, epsilon, c, dist_codes, param_a, param_b, gaps,
+                        pulls, reward_sums, estimates, state,
+                        u_explore, u_arm, u_reward, z_reward,
+                        arm_chunk[:n_chunk], reward_chunk[:n_chunk], regret_chunk[:n_chunk])
+        
+        stop = start + n_chunk
+        arm_history[start:stop] = arm_chunk[:n_chunk]
+        rewards[start:stop] = reward_chunk[:n_chunk]
+        regrets[start:stop] = regret_chunk[:n_chunk]
+    
+    algorithm.pulls[:] = pulls
+    algorithm.rewards[:] = reward_sums
+    algorithm.estimates[:] = estimates
+    algorithm.total_pulls = int(state[0])
+    if algorithm._regret_gaps is not None:
+        algorithm.cumulative_regret += float(state[1])
+    pulled = np.flatnonzero(pulls)
+    algorithm._after_bulk_update(pulled, pulls[pulled])
+    
+    return {
+        'rewards': rewards,
+        'regrets': regrets,
+        'arm_history': arm_history,
+        'final_estimates': algorithm.estimates.copy(),
+        'final_pulls': algorithm.pulls.copy(),
+        'optimal_arm': environment.get_optimal_arm(),
+        'estimated_optimal_arm': algorithm.get_estimated_optimal_arm()
+    }
@@ -0,0 +1,191 @@
+import json
+import time
+from typing import Dict, Any, List, Callable, Tuple
+import numpy as np
+
+# Phases of one run_experiment trial. 'bookkeeping' is the time from the end
+# of update() to the next select_arm(): regret accounting, result buffers,
+# chunk flushes and checkpoints, and the loop itself.
+PHASES = ('select_arm', 'pull', 'update', 'bookkeeping')
+
+class PhaseProfiler:
+    """
+    Sampled per-phase timings of the run_experiment trial loop
+    
+    Pass an instance as run_experiment(..., profiler=profiler) (or to
+    compare_algorithms). Every sample_every-th trial is timed phase by phase
+    with perf_counter_ns; the other trials only pay a counter decrement per
+    call. Runs without a profiler are not instrumented at all.
+    
+    Timings are grouped by label (the algorithm name in compare_algorithms,
+    otherwise the algorithm class name). report() estimates each phase's
+    total time as its mean sampled duration times the number of calls, and
+    write_trace() exports the sampled trials as a Chrome trace, which
+    chrome://tracing, Perfetto and speedscope can open.
+    """
+    def __init__(self, sample_every: int = 100, max_samples: int = 100_000, trace: bool = False,
+                 max_trace_events: int = 200_000):
+        """
+        Args:
+            sample_every: Time one trial out of this many
+            max_samples: Durations kept per label and phase for percentiles
+                (means use all samples)
+            trace: Keep sampled events for write_trace()
+            max_trace_events: Maximum number of trace events kept
+        """
+        if sample_every < 1:
+            raise ValueError(f"sample_every must be >= 1, got {sample_every}")
+        self.sample_every = sample_every
+        self.max_samples = max_samples
+        self.trace = trace
+        self.max_trace_events = max_trace_events
+        self.label = None
+        self._stats = {}
+        self._events = []
+        self._origin = time.perf_counter_ns()
+    
+    def set_label(self, label: str):
+        """Group the following runs under label (None: algorithm class name)"""
+        self.label = label
+    
+    def _label_stats(self, label: str) -> Dict[str, Any]:
+        if label not in self._stats:
+            self._stats[label] = {
+                'call_counters': [],
+                'totals': dict.fromkeys(PHASES, 0),
+                'counts': dict.fromkeys(PHASES, 0),
+                'durations': {phase: [] for phase in PHASES}
+            }
+        return self._stats[label]
+    
+    def _record(self, stats: Dict[str, Any], label: str, phase: str, start: int, end: int):
+        duration = end - start
+        stats['totals'][phase] += duration
+        stats['counts'][phase] += 1
+        if len(stats['durations'][phase]) < self.max_samples:
+            stats['durations'][phase].append(duration)
+        if self.trace and len(self._events) < self.max_trace_events:
+            self._events.append((label, phase, start, duration))
+    
+    def instrument(self, algorithm, environment) -> Tuple[Callable, Callable, Callable]:
+        """
+        Timed versions of algorithm.select_arm, environment.pull and algorithm.update
+        
+        The three functions share the sampling state of one run and must be
+        called in trial order (select, pull, update).
+        """
+        label = self.label or type(algorithm).__name__
+        stats = self._label_stats(label)
+        record = self._record
+        clock = time.perf_counter_ns
+        select_arm, pull, update = algorithm.select_arm, environment.pull, algorithm.update
+        sample_every = self.sample_every
+        
+        countdown = 0
+        n_sampled = 0
+        sampling = False
+        update_end = None
+        
+        def timed_select_arm(*args, **kwargs):
+            nonlocal countdown, n_sampled, sampling, update_end
+            if update_end is not None:
+                record(stats, label, 'bookkeeping', update_end, clock())
+                update_end = None
+            if countdown:
+                countdown -= 1
+                return select_arm(*args, **kwargs)
+            countdown = sample_every - 1
+            n_sampled += 1
+            sampling = True
+            start = clock()
+            arm = select_arm(*args, **kwargs)
+            record(stats, label, 'select_arm', start, clock())
+            return arm
+        
+        def timed_pull(arm):
+            if not sampling:
+                return pull(arm)
+            start = clock()
+            reward = pull(arm)
+            record(stats, label, 'pull', start, clock())
+            return reward
+        
+        def timed_update(*args, **kwargs):
+            nonlocal sampling, update_end
+            if not sampling:
+                return update(*args, **kwargs)
+            sampling = False
+            start = clock()
+            update(*args, **kwargs)
+            update_end = clock()
+            record(stats, label, 'update', start, update_end)
+        
+        # Calls so far: the first of every sample_every calls is sampled
+        stats['call_counters'].append(lambda: n_sampled * sample_every - countdown)
+        return timed_select_arm, timed_pull, timed_update
+    
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-label timing summary
+        
+        Returns:
+            Dictionary mapping labels to 'calls' (trials run), 'sampled_trials'
+            and 'phases': for each phase the number of 'samples', 'mean_us',
+            'p50_us', 'p99_us' and 'max_us' of the sampled durations, the
+            'estimated_total_s' (mean times calls) and its 'share' of the
+            estimated trial time
+        """
+        report = {}
+        for label, stats in self._stats.items():
+            calls = sum(counter() for counter in stats['call_counters'])
+            phases = {}
+            for phase in PHASES:
+                count = stats['counts'][phase]
+                if count == 0:
+                    continue
+                durations = np.array(stats['durations'][phase]) / 1e3
+                mean_us = stats['totals'][phase] / count / 1e3
+                phases[phase] = {
+                    'samples': count,
+                    'mean_us': mean_us,
+                    'p50_us': float(np.percentile(durations, 50)),
+                    'p99_us': float(np.percentile(durations, 99)),
+                    'max_us': float(durations.max()),
+                    'estimated_total_s': mean_us * calls / 1e6
+                }
+            total = sum(phase['estimated_total_s'] for phase in phases.values())
+            for phase in phases.values():
+                phase['share'] = phase['estimated_total_s'] / total if total > 0 else 0.0
+            report[label] = {
+                'calls': calls,
+                'sampled_trials': stats['counts']['select_arm'],
+                'phases': phases
+            }
+        return report
+    
+    def write_trace(self, path: str):
+        """
+        Write sampled events as a Chrome trace (JSON), one thread per label
+        
+        Requires trace=True.
+        """
+        if not self.trace:
+            raise ValueError("Profiler was created with trace=False")
+        
+        thread_ids = {label: tid for tid, label in enumerate(self._stats, 1)}
+        events: List[Dict[str, Any]] = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': label}}
+            for label, tid in thread_ids.items()
+        ]
+        for label, phase, start, duration in self._events:
+            events.append({
+                'name': phase,
+                'cat': 'mab',
+                'ph': 'X',
+                'pid': 1,
+                'tid': thread_ids[label],
+                'ts': (start - self._origin) / 1e3,
+                'dur': duration / 1e3
+            })
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ns'}, f)
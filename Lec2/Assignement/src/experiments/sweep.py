@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter sweeps over MABConfig.algorithm_params
+
+A search space maps parameter names to a list of values (grid) or a
+distribution (Uniform, LogUniform). Every configuration is evaluated on the
+same seeds (common random numbers), with all seeds of a job advanced together
+by the batched engine (select_arm_batch/update_batch) and jobs spread over a
+process pool.
+
+Successive halving runs all configurations on a short horizon, keeps the best
+1/eta by mean cumulative regret and continues the survivors (from where they
+stopped, not from scratch) on an eta times longer horizon, up to n_trials.
+Hyperband runs several such brackets that trade the number of sampled
+configurations against the shortest horizon:
+
+    python -m experiments.sweep --algorithm epsilon_greedy --method hyperband
+    python -m experiments.sweep --algorithm ucb --method grid --n-trials 5000
+"""
+
+import argparse
+import itertools
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Dict, Any, List, Union
+
+import numpy as np
+
+from utils.config import MABConfig
+from environment.mab_environment import MABEnvironment
+from algorithms.base_algorithm import BaseMABAlgorithm
+from algorithms.exploration_only import ExplorationOnly
+from algorithms.exploitation_only import ExploitationOnly
+from algorithms.epsilon_greedy import EpsilonGreedy
+from algorithms.ucb import UCB
+from algorithms.thompson_sampling import ThompsonSampling
+
+# Algorithm classes by their MABConfig.algorithm_params key
+ALGORITHM_CLASSES = {
+    'exploration_only': ExplorationOnly,
+    'exploitation_only': ExploitationOnly,
+    'epsilon_greedy': EpsilonGreedy,
+    'ucb': UCB,
+    'thompson_sampling': ThompsonSampling
+}
+
+class Uniform:
+    """Continuous uniform distribution on [low, high]"""
+    def __init__(self, low: float, high: float):
+        if not low < high:
+            raise ValueError(f"Need low < high, got {low} and {high}")
+        self.low = low
+        self.high = high
+    
+    def sample(self, rng: np.random.Generator) -> float:
+        return float(rng.uniform(self.low, self.high))
+    
+    def __repr__(self) -> str:
+        return f"Uniform({self.low}, {self.high})"
+
+class LogUniform(Uniform):
+    """Distribution whose logarithm is uniform on [log(low), log(high)]"""
+    def __init__(self, low: float, high: float):
+        if low <= 0:
+            raise ValueError(f"LogUniform needs low > 0, got {low}")
+        super().__init__(low, high)
+    
+    def sample(self, rng: np.random.Generator) -> float:
+        return float(np.exp(rng.uniform(np.log(self.low), np.log(self.high))))
+    
+    def __repr__(self) -> str:
+        return f"LogUniform({self.low}, {self.high})"
+
+SearchSpace = Dict[str, Union[List[Any], Uniform]]
+
+# Spaces used by the command line interface
+DEFAULT_GRIDS = {
+    'epsilon_greedy': {'epsilon': [0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5]},
+    'ucb': {'c': [0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0]},
+    'thompson_sampling': {'prior_alpha': [0.5, 1.0, 2.0, 4.0], 'prior_beta': [0.5, 1.0, 2.0, 4.0]}
+}
+DEFAULT_DISTRIBUTIONS = {
+    'epsilon_greedy': {'epsilon': LogUniform(0.001, 0.5)},
+    'ucb': {'c': LogUniform(0.01, 10.0)},
+    'thompson_sampling': {'prior_alpha': LogUniform(0.1, 10.0), 'prior_beta': LogUniform(0.1, 10.0)}
+}
+
+def _advance_job(algorithm: BaseMABAlgorithm, environment: MABEnvironment, regrets: np.ndarray,
+                 n_steps: int):
+    """
+    Continue one job's batch of runs by n_steps trials
+    
+    Runs in a worker process (or inline); the updated objects are returned
+    so the next rung can continue from them.
+    """
+    gaps = environment.gaps
+    for _ in range(n_steps):
+        arms = algorithm.select_arm_batch()
+        algorithm.update_batch(arms, environment.pull_batch(arms))
+        regrets += gaps[arms]
+    return algorithm, environment, regrets
+
+class HyperparameterSweep:
+    """
+    Parallel hyperparameter search for one algorithm
+    """
+    def __init__(self, config: MABConfig, algorithm: str, space: SearchSpace, n_seeds: int = 32,
+                 seeds_per_job: int = None, max_workers: int = None, confidence: float = 0.95,
+                 environment: MABEnvironment = None):
+        """
+        Initialize sweep
+        
+        Args:
+            config: Experiment configuration; parameters in
+                config.algorithm_params[algorithm] that are not swept are
+                passed to every configuration
+            algorithm: Key of the algorithm in ALGORITHM_CLASSES
+            space: Parameter name -> list of values or distribution
+            n_seeds: Number of runs per configuration
+            seeds_per_job: Runs advanced together by one job (default: all
+                n_seeds, i.e. one job per configuration). Results depend on
+                this grouping but not on max_workers
+            max_workers: Number of worker processes (defaults to CPU count;
+                1 runs everything in this process)
+            confidence: Level of the reported confidence intervals
+            environment: Stationary environment whose arms are used (built
+                from config if None)
+        """
+        if algorithm not in ALGORITHM_CLASSES:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if not space:
+            raise ValueError("Search space is empty")
+        if environment is None:
+            environment = MABEnvironment(
+                n_arms=config.n_arms,
+                reward_distributions=config.reward_distributions,
+                seed=config.seed,
+                reward_block_size=config.reward_block_size
+            )
+        if not environment.stationary:
+            raise ValueError("Sweeps rebuild the environment per job and need a stationary one")
+        
+        self.config = config
+        self.algorithm = algorithm
+        self.space = space
+        self.n_seeds = n_seeds
+        self.seeds_per_job = min(seeds_per_job or n_seeds, n_seeds)
+        self.max_workers = max_workers
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.confidence = confidence
+        self.reward_spec = environment.reward_spec
+        
+        # One (environment, algorithm) seed pair per job, shared by all
+        # configurations; the last job may hold fewer runs
+        jobs_root, space_root = np.random.SeedSequence(config.seed).spawn(2)
+        n_jobs = math.ceil(n_seeds / self.seeds_per_job)
+        self._job_sizes = [min(self.seeds_per_job, n_seeds - i * self.seeds_per_job) for i in range(n_jobs)]
+        self._job_seeds = [seq.spawn(2) for seq in jobs_root.spawn(n_jobs)]
+        self.rng = np.random.default_rng(space_root)
+    
+    def grid(self) -> List[Dict[str, Any]]:
+        """All combinations of a search space made of value lists"""
+        for name, values in self.space.items():
+            if not isinstance(values, (list, tuple)):
+                raise ValueError(f"Grid search needs a list of values for '{name}', got {values!r}")
+        names = list(self.space)
+        return [dict(zip(names, values)) for values in itertools.product(*self.space.values())]
+    
+    def sample(self, n: int) -> List[Dict[str, Any]]:
+        """n random configurations (list entries are drawn uniformly)"""
+        configs = []
+        for _ in range(n):
+            params = {}
+            for name, values in self.space.items():
+                if isinstance(values, (list, tuple)):
+                    params[name] = values[self.rng.integers(len(values))]
+                else:
+                    params[name] = values.sample(self.rng)
+            configs.append(params)
+        return configs
+    
+    def _start(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fresh runs of one configuration"""
+        kwargs = {**self.config.algorithm_params.get(self.algorithm, {}), **params}
+        algorithm_class = ALGORITHM_CLASSES[self.algorithm]
+        jobs = []
+        for size, (env_seq, algorithm_seq) in zip(self._job_sizes, self._job_seeds):
+            environment = MABEnvironment(
+                n_arms=self.config.n_arms,
+                reward_distributions=self.reward_spec,
+                reward_block_size=self.config.reward_block_size,
+                rng=np.random.default_rng(env_seq)
+            )
+            algorithm = algorithm_class(self.config.n_arms, rng=np.random.default_rng(algorithm_seq), **kwargs)
+            algorithm.reset_batch(size)
+            jobs.append((algorithm, environment, np.zeros(size)))
+        return {'params': params, 'n_trials': 0, 'jobs': jobs}
+    
+    def _advance(self, runs: List[Dict[str, Any]], horizon: int, executor: ProcessPoolExecutor):
+        """Continue every run to horizon trials"""
+        if executor is None:
+            for run in runs:
+                run['jobs'] = [_advance_job(*job, horizon - run['n_trials']) for job in run['jobs']]
+                run['n_trials'] = horizon
+            return
+        
+        futures = [[executor.submit(_advance_job, *job, horizon - run['n_trials']) for job in run['jobs']]
+                   for run in runs]
+        for run, jobs in zip(runs, futures):
+            run['jobs'] = [job.result() for job in jobs]
+            run['n_trials'] = horizon
+    
+    def _summary(self, run: Dict[str, Any], rung: int) -> Dict[str, Any]:
+        """Regret statistics of a run at its current horizon"""
+        regrets = np.concatenate([job[2] for job in run['jobs']])
+        mean = regrets.mean()
+        std = regrets.std(ddof=1) if len(regrets) > 1 else 0.0
+        half_width = self.z * std / np.sqrt(len(regrets))
+        return {
+            'params': run['params'],
+            'n_trials': run['n_trials'],
+            'rung': rung,
+            'mean_regret': mean,
+            'std_regret': std,
+            'ci_low': mean - half_width,
+            'ci_high': mean + half_width,
+            'n_seeds': len(regrets)
+        }
+    
+    def _run_rungs(self, configs: List[Dict[str, Any]], horizons: List[int], eta: int) -> Dict[str, Any]:
+        """Successive halving over the given increasing horizons"""
+        start = time.perf_counter()
+        runs = [self._start(params) for params in configs]
+        entries = []
+        simulated_trials = 0
+        
+        executor = ProcessPoolExecutor(max_workers=self.max_workers) if self.max_workers != 1 else None
+        try:
+            for rung, horizon in enumerate(horizons):
+                simulated_trials += sum(horizon - run['n_trials'] for run in runs) * self.n_seeds
+                self._advance(runs, horizon, executor)
+                ranked = sorted(runs, key=lambda run: self._summary(run, rung)['mean_regret'])
+                n_keep = len(ranked) if rung == len(horizons) - 1 else max(1, math.ceil(len(ranked) / eta))
+                entries.extend(self._summary(run, rung) for run in ranked[n_keep:])
+                runs = ranked[:n_keep]
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        entries.extend(self._summary(run, len(horizons) - 1) for run in runs)
+        
+        return {
+            'ranking': self._rank(entries),
+            'simulated_trials': simulated_trials,
+            'elapsed': time.perf_counter() - start
+        }
+    
+    def _rank(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Configurations that got further first, then by mean regret"""
+        return sorted(entries, key=lambda entry: (-entry['n_trials'], entry['mean_regret']))
+    
+    def evaluate(self, configs: List[Dict[str, Any]], n_trials: int = None) -> Dict[str, Any]:
+        """
+        Run every configuration to the full horizon
+        
+        Args:
+            configs: Parameter dicts (e.g. from grid() or sample())
+            n_trials: Horizon (uses config if None)
+        
+        Returns:
+            Dictionary with the ranked entries under 'ranking' (see
+            successive_halving), 'simulated_trials' and 'elapsed' seconds
+        """
+        return self._run_rungs(configs, [n_trials or self.config.n_trials], eta=1)
+    
+    def successive_halving(self, configs: List[Dict[str, Any]], min_trials: int, n_trials: int = None,
+                           eta: int = 3) -> Dict[str, Any]:
+        """
+        Evaluate configurations with successive halving
+        
+        Horizons are min_trials, eta * min_trials, ... up to n_trials. After
+        each one, the best ceil(n / eta) configurations by mean cumulative
+        regret are continued to the next.
+        
+        Args:
+            configs: Parameter dicts (e.g. from grid() or sample())
+            min_trials: Horizon of the first rung
+            n_trials: Final horizon (uses config if None)
+            eta: Reduction factor between rungs
+        
+        Returns:
+            Dictionary with:
+            - 'ranking': one entry per configuration with 'params', the
+              horizon it reached ('n_trials', 'rung'), 'mean_regret',
+              'std_regret' and the confidence interval 'ci_low'/'ci_high' of
+              its cumulative regret there, and 'n_seeds'. Entries are sorted
+              by horizon reached, then by mean regret
+            - 'simulated_trials': trials simulated over all runs
+            - 'elapsed': wall time in seconds
+        """
+        if n_trials is None:
+            n_trials = self.config.n_trials
+        if eta < 2:
+            raise ValueError(f"eta must be >= 2, got {eta}")
+        if not 0 < min_trials <= n_trials:
+            raise ValueError(f"Need 0 < min_trials <= n_trials, got {min_trials} and {n_trials}")
+        
+        horizons = []
+        horizon = min_trials
+        while horizon < n_trials:
+            horizons.append(horizon)
+            horizon *= eta
+        horizons.append(n_trials)
+        return self._run_rungs(configs, horizons, eta)
+    
+    def hyperband(self, min_trials: int, n_trials: int = None, eta: int = 3) -> Dict[str, Any]:
+        """
+        Evaluate sampled configurations with Hyperband (Li et al., 2017)
+        
+        Bracket s (s = s_max, ..., 0) runs successive halving on
+        ceil((s_max + 1) / (s + 1) * eta^s) new samples from the search space,
+        starting at horizon n_trials / eta^s.
+        
+        Args:
+            min_trials: Shortest horizon of any bracket
+            n_trials: Final horizon (uses config if None)
+            eta: Reduction factor between rungs
+        
+        Returns:
+            Dictionary as from successive_halving, with the entries of all
+            brackets ranked together
+        """
+        if n_trials is None:
+            n_trials = self.config.n_trials
+        if not 0 < min_trials <= n_trials:
+            raise ValueError(f"Need 0 < min_trials <= n_trials, got {min_trials} and {n_trials}")
+        
+        s_max = int(math.log(n_trials / min_trials, eta) + 1e-9)
+        entries = []
+        simulated_trials = 0
+        elapsed = 0.0
+        for s in range(s_max, -1, -1):
+            n_configs = math.ceil((s_max + 1) / (s + 1) * eta ** s)
+            bracket = self.successive_halving(self.sample(n_configs), max(1, n_trials // eta ** s),
+                                              n_trials, eta)
+            entries.extend(bracket['ranking'])
+            simulated_trials += bracket['simulated_trials']
+            elapsed += bracket['elapsed']
+        
+        return {'ranking': self._rank(entries), 'simulated_trials': simulated_trials, 'elapsed': elapsed}
+    
+    def best_params(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Full parameters of the best configuration of a sweep result"""
+        return {**self.config.algorithm_params.get(self.algorithm, {}), **result['ranking'][0]['params']}
+    
+    def apply_best(self, result: Dict[str, Any], config: MABConfig = None):
+        """Store the best parameters in config.algorithm_params (self.config if None)"""
+        (config or self.config).set_algorithm_params(self.algorithm, self.best_params(result))
+    
+    def print_table(self, result: Dict[str, Any], top: int = None):
+        """Print the ranked configurations with their confidence intervals"""
+        ranking = result['ranking'][:top]
+        print(f"\n{'rank':>4}  {'trials':>8}  {'mean regret':>12}  {f'{self.confidence:.0%} CI':>21}  params")
+        for rank, entry in enumerate(ranking, 1):
+            params = ', '.join(f"{name}={value:.4g}" if isinstance(value, float) else f"{name}={value}"
+                               for name, value in entry['params'].items())
+            ci = f"[{entry['ci_low']:.2f}, {entry['ci_high']:.2f}]"
+            print(f"{rank:>4}  {entry['n_trials']:>8}  {entry['mean_regret']:>12.2f}  {ci:>21}  {params}")
+        print(f"\n{len(result['ranking'])} configurations, {result['simulated_trials']:,} simulated trials, "
+              f"{result['elapsed']:.1f}s")
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sweep algorithm hyperparameters")
+    parser.add_argument('--algorithm', choices=sorted(DEFAULT_GRIDS), default='epsilon_greedy')
+    parser.add_argument('--method', choices=('grid', 'halving', 'hyperband'), default='halving',
+                        help="Full grid, successive halving over the grid, or Hyperband over distributions")
+    parser.add_argument('--n-arms', type=int, default=10)
+    parser.add_argument('--n-trials', type=int, default=10_000)
+    parser.add_argument('--min-trials', type=int, default=None,
+                        help="Shortest horizon for halving/hyperband (default n_trials / 27)")
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--seeds', type=int, default=32, help="Runs per configuration")
+    parser.add_argument('--seeds-per-job', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (1 = no pool)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--top', type=int, default=20, help="Rows of the table to print")
+    args = parser.parse_args(argv)
+    
+    config = MABConfig()
+    config.seed = args.seed
+    config.get_bernoulli_config(n_arms=args.n_arms, n_trials=args.n_trials)
+    min_trials = args.min_trials or max(1, args.n_trials // 27)
+    space = DEFAULT_DISTRIBUTIONS[args.algorithm] if args.method == 'hyperband' else DEFAULT_GRIDS[args.algorithm]
+    sweep = HyperparameterSweep(config, args.algorithm, space, n_seeds=args.seeds,
+                                seeds_per_job=args.seeds_per_job, max_workers=args.workers)
+    
+    if args.method == 'grid':
+        result = sweep.evaluate(sweep.grid())
+    elif args.method == 'halving':
+        result = sweep.successive_halving(sweep.grid(), min_trials, eta=args.eta)
+    else:
+        result = sweep.hyperband(min_trials, eta=args.eta)
+    
+    sweep.print_table(result, args.top)
+    print(f"Best {args.algorithm} parameters: {sweep.best_params(result)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
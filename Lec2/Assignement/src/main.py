@@ -9,6 +9,7 @@ from algorithms.exploration_only import ExplorationOnly
 from algorithms.exploitation_only import ExploitationOnly
 from algorithms.epsilon_greedy import EpsilonGreedy
 from algorithms.ucb import UCB
+from algorithms.thompson_sampling import ThompsonSampling
 
 def test_algorithm_implementation(algorithm, name):
     """Test if an algorithm is properly implemented"""
@@ -35,12 +36,13 @@ def main():
     # Create experiment runner
     runner = MABExperimentRunner(config)
     
-    # Create algorithms
+    # Create algorithms (each with its own random stream)
     algorithms = {
-        'Exploration Only': ExplorationOnly(config.n_arms),
-        'Exploitation Only': ExploitationOnly(config.n_arms),
-        'Epsilon-Greedy': EpsilonGreedy(config.n_arms, epsilon=0.1),
-        'UCB': UCB(config.n_arms, c=2.0)
+        'Exploration Only': ExplorationOnly(config.n_arms, rng=config.spawn_rng()),
+        'Exploitation Only': ExploitationOnly(config.n_arms, rng=config.spawn_rng()),
+        'Epsilon-Greedy': EpsilonGreedy(config.n_arms, epsilon=0.1, rng=config.spawn_rng()),
+        'UCB': UCB(config.n_arms, c=2.0, rng=config.spawn_rng()),
+        'Thompson Sampling': ThompsonSampling(config.n_arms, rng=config.spawn_rng())
     }
     
     # Test which algorithms are implemented
@@ -0,0 +1,181 @@
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+import numpy as np
+from algorithms.base_algorithm import BaseMABAlgorithm
+
+class BanditDecisionServer:
+    """
+    Asyncio decision service around any BaseMABAlgorithm
+    
+    Concurrent select() calls are queued and answered together: every tick,
+    up to max_batch pending requests are served by a single vectorized
+    algorithm.select_arms(n) call. Each decision gets an id; reward feedback
+    may arrive much later through update(decision_id, reward).
+    
+    Usage:
+        async with BanditDecisionServer(algorithm) as server:
+            decision_id, arm = await server.select()
+            ...
+            server.update(decision_id, reward)
+    """
+    def __init__(self, algorithm: BaseMABAlgorithm, tick_interval: float = 0.0, max_batch: int = 1024,
+                 max_outstanding: int = 1_000_000, latency_window: int = 100_000):
+        """
+        Args:
+            algorithm: Algorithm making the decisions
+            tick_interval: Seconds to wait after the first request of a tick so
+                that more requests can join the batch (0 serves whatever is
+                queued when the event loop gets to it)
+            max_batch: Maximum number of decisions per select_arms call
+            max_outstanding: Decisions awaiting feedback to remember; the
+                oldest are forgotten beyond this
+            latency_window: Number of most recent request latencies kept
+        """
+        self.algorithm = algorithm
+        self.tick_interval = tick_interval
+        self.max_batch = max_batch
+        self.max_outstanding = max_outstanding
+        
+        self._pending: List[Tuple[float, asyncio.Future]] = []
+        self._outstanding: Dict[int, int] = OrderedDict()  # decision id -> arm
+        self._ids = itertools.count()
+        self._wakeup = None
+        self._task = None
+        
+        # Latency counters (seconds), kept in a ring buffer
+        self._latencies = np.zeros(latency_window)
+        self._n_latencies = 0
+        self.n_batches = 0
+        self.n_failed_batches = 0
+        self.n_decisions = 0
+        self.n_updates = 0
+        self.n_unknown_updates = 0
+    
+    async def start(self):
+        """Start the batching loop on the running event loop"""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._serve())
+    
+    async def stop(self):
+        """Stop the batching loop; queued requests are cancelled"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+    
+    async def __aenter__(self):
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+    
+    async def select(self) -> Tuple[int, int]:
+        """
+        Request one decision
+        
+        Returns:
+            Tuple of (decision_id, arm)
+        """
+        if self._task is None:
+            raise RuntimeError("Server is not running; call start() first")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((time.perf_counter(), future))
+        self._wakeup.set()
+        return await future
+    
+    def update(self, decision_id: int, reward: float) -> bool:
+        """
+        Report the reward of an earlier decision
+        
+        Args:
+            decision_id: Id returned by select()
+            reward: Observed reward
+        
+        Returns:
+            False if the decision is unknown (already updated or forgotten)
+        """
+        arm = self._outstanding.pop(decision_id, None)
+        if arm is None:
+            self.n_unknown_updates += 1
+            return False
+        self.algorithm.update(arm, reward)
+        self.n_updates += 1
+        return True
+    
+    async def _serve(self):
+        """Batching loop: one vectorized selection per tick"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if self.tick_interval > 0:
+                await asyncio.sleep(self.tick_interval)
+            while self._pending:
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                self._dispatch(batch)
+    
+    def _dispatch(self, batch: List[Tuple[float, asyncio.Future]]):
+        """
+        Answer a batch of requests with one select_arms call
+        
+        If select_arms raises, every waiting request of the batch gets the
+        exception and the server keeps serving later requests.
+        """
+        try:
+            arms = self.algorithm.select_arms(len(batch)).tolist()
+        except Exception as exc:
+            for _, future in batch:
+                if not future.cancelled():
+                    future.set_exception(exc)
+            self.n_failed_batches += 1
+            return
+        now = time.perf_counter()
+        
+        answered = 0
+        for (enqueued, future), arm in zip(batch, arms):
+            if future.cancelled():
+                continue
+            decision_id = next(self._ids)
+            self._outstanding[decision_id] = arm
+            future.set_result((decision_id, arm))
+            self._latencies[self._n_latencies % len(self._latencies)] = now - enqueued
+            self._n_latencies += 1
+            answered += 1
+        
+        while len(self._outstanding) > self.max_outstanding:
+            self._outstanding.popitem(last=False)
+        self.n_batches += 1
+        self.n_decisions += answered
+    
+    def latency_stats(self) -> Dict[str, float]:
+        """
+        Request latency percentiles over the most recent requests
+        
+        Returns:
+            Dictionary with request/batch counters and p50/p99/max latency in ms
+        """
+        latencies = self._latencies[:min(self._n_latencies, len(self._latencies))] * 1000
+        stats = {
+            'decisions': self.n_decisions,
+            'batches': self.n_batches,
+            'failed_batches': self.n_failed_batches,
+            'mean_batch_size': self.n_decisions / self.n_batches if self.n_batches else 0.0,
+            'updates': self.n_updates,
+            'unknown_updates': self.n_unknown_updates,
+            'outstanding': len(self._outstanding)
+        }
+        if len(latencies):
+            stats['p50_ms'], stats['p99_ms'] = np.percentile(latencies, [50, 99])
+            stats['max_ms'] = latencies.max()
+        return stats
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+In-process load generator for BanditDecisionServer
+
+Simulated clients request decisions concurrently and report rewards drawn
+from a MABEnvironment, optionally after a delay:
+
+    python -m serving.load_generator --requests 100000 --concurrency 256
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, Any
+from environment.mab_environment import MABEnvironment
+from serving.decision_server import BanditDecisionServer
+
+async def run_load(server: BanditDecisionServer, environment: MABEnvironment, n_requests: int,
+                   concurrency: int = 64, feedback_delay: float = 0.0) -> Dict[str, Any]:
+    """
+    Drive a running server with concurrent clients
+    
+    Args:
+        server: Started decision server
+        environment: Reward oracle for the server's decisions
+        n_requests: Total number of decisions to request
+        concurrency: Number of concurrent clients
+        feedback_delay: Seconds between a decision and its reward report
+    
+    Returns:
+        Dictionary with throughput, reward/regret totals and server latency stats
+    """
+    loop = asyncio.get_running_loop()
+    remaining = n_requests
+    total_reward = 0.0
+    total_regret = 0.0
+    
+    async def client():
+        nonlocal remaining, total_reward, total_regret
+        while remaining > 0:
+            remaining -= 1
+            decision_id, arm = await server.select()
+            reward = environment.pull(arm)
+            total_reward += reward
+            total_regret += environment.gaps[arm]
+            if feedback_delay > 0:
+                loop.call_later(feedback_delay, server.update, decision_id, reward)
+            else:
+                server.update(decision_id, reward)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    if feedback_delay > 0:
+        # Let the last delayed rewards arrive
+        await asyncio.sleep(feedback_delay)
+    
+    return {
+        'requests': n_requests,
+        'seconds': elapsed,
+        'decisions_per_sec': n_requests / elapsed,
+        'total_reward': total_reward,
+        'total_regret': total_regret,
+        'server': server.latency_stats()
+    }
+
+def main():
+    # Imported here so importing the module does not pull in every algorithm
+    from algorithms.epsilon_greedy import EpsilonGreedy
+    
+    parser = argparse.ArgumentParser(description="Load-test BanditDecisionServer")
+    parser.add_argument('--arms', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=100_000)
+    parser.add_argument('--concurrency', type=int, default=256)
+    parser.add_argument('--feedback-delay', type=float, default=0.0)
+    parser.add_argument('--tick', type=float, default=0.0, help="Server tick interval in seconds")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    environment = MABEnvironment(args.arms, seed=args.seed)
+    algorithm = EpsilonGreedy(args.arms, epsilon=0.1, seed=args.seed)
+    
+    async def run():
+        async with BanditDecisionServer(algorithm, tick_interval=args.tick) as server:
+            return await run_load(server, environment, args.requests, args.concurrency, args.feedback_delay)
+    
+    report = asyncio.run(run())
+    server = report.pop('server')
+    for key, value in {**report, **server}.items():
+        print(f"{key:>18}: {value:.4g}" if isinstance(value, float) else f"{key:>18}: {value}")
+    print(f"{'optimal arm':>18}: {environment.get_optimal_arm()}")
+    print(f"{'estimated optimal':>18}: {algorithm.get_estimated_optimal_arm()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import json
+import os
+from typing import Dict, Any
+import numpy as np
+
+# A checkpoint is a directory holding one .npy file per state array and a
+# JSON manifest with everything else. Arrays are reloaded memory-mapped
+# (copy-on-write), so restoring does not read or copy them up front.
+MANIFEST_NAME = 'manifest.json'
+FORMAT_VERSION = 1
+
+def _read_manifest(path: str) -> Dict[str, Any]:
+    """Manifest of the checkpoint in path, or None if there is none"""
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        return json.load(f)
+
+def checkpoint_exists(path: str) -> bool:
+    """Whether path holds a complete checkpoint"""
+    return _read_manifest(path) is not None
+
+def save_checkpoint(path: str, trial: int, algorithm, environment, extra: Dict[str, Any] = None):
+    """
+    Write algorithm and environment state to a checkpoint directory
+    
+    Array files carry a sequence number and the manifest is replaced
+    atomically as the last step, so a crash while saving leaves the previous
+    checkpoint intact. Files of the previous checkpoint are removed after.
+    
+    Args:
+        path: Checkpoint directory (created if missing)
+        trial: Number of trials completed
+        algorithm: Algorithm providing hyperparameters() and get_state()
+        environment: Environment providing get_state()
+        extra: Additional JSON-serialisable values to store
+    """
+    os.makedirs(path, exist_ok=True)
+    previous = _read_manifest(path)
+    seq = previous['seq'] + 1 if previous is not None else 0
+    
+    manifest = {
+        'version': FORMAT_VERSION,
+        'seq': seq,
+        'trial': int(trial),
+        'hyperparameters': algorithm.hyperparameters(),
+        'extra': extra or {}
+    }
+    for section, state in (('algorithm', algorithm.get_state()), ('environment', environment.get_state())):
+        arrays, values = {}, {}
+        for key, value in state.items():
+            if isinstance(value, np.ndarray):
+                filename = f'{section}.{key}.{seq}.npy'
+                np.save(os.path.join(path, filename), value)
+                arrays[key] = filename
+            else:
+                values[key] = value
+        manifest[section] = {'arrays': arrays, 'values': values}
+    
+    tmp_path = os.path.join(path, MANIFEST_NAME + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(path, MANIFEST_NAME))
+    
+    if previous is not None:
+        for section in ('algorithm', 'environment'):
+            for filename in previous[section]['arrays'].values():
+                try:
+                    os.remove(os.path.join(path, filename))
+                except FileNotFoundError:
+                    pass
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """
+    Read a checkpoint directory
+    
+    Returns:
+        Manifest dict where the 'algorithm' and 'environment' entries are
+        state dicts (as from get_state) with memory-mapped arrays
+    """
+    manifest = _read_manifest(path)
+    if manifest is None:
+        raise FileNotFoundError(f"No checkpoint in {path}")
+    if manifest['version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {manifest['version']}")
+    
+    for section in ('algorithm', 'environment'):
+        state = dict(manifest[section]['values'])
+        for key, filename in manifest[section]['arrays'].items():
+            state[key] = np.load(os.path.join(path, filename), mmap_mode='c')
+        manifest[section] = state
+    return manifest
+
+def restore_checkpoint(path: str, algorithm, environment) -> Dict[str, Any]:
+    """
+    Load a checkpoint into existing algorithm and environment instances
+    
+    They must be built with the same settings as when the checkpoint was
+    saved; algorithm hyperparameters are checked.
+    
+    Returns:
+        Loaded checkpoint (see load_checkpoint), with 'trial' and 'extra'
+    """
+    checkpoint = load_checkpoint(path)
+    # Compare in JSON form (tuples become lists, etc.)
+    expected = json.loads(json.dumps(algorithm.hyperparameters()))
+    if checkpoint['hyperparameters'] != expected:
+        raise ValueError(f"Checkpoint was saved for {checkpoint['hyperparameters']}, not {expected}")
+    
+    algorithm.set_state(checkpoint['algorithm'])
+    environment.set_state(checkpoint['environment'])
+    return checkpoint
@@ -10,24 +10,42 @@ class MABConfig:
         self.n_arms = 10
         self.n_trials = 1000
         self.seed = 42
+        self._seed_seq = None
         
         # Reward distributions (optional - will use default Bernoulli if None)
         self.reward_distributions = None
         
+        # Pre-sample rewards in blocks of this size per arm (None draws per pull)
+        self.reward_block_size = None
+        
         # Algorithm-specific parameters
         self.algorithm_params = {
             'epsilon_greedy': {'epsilon': 0.1},
             'ucb': {'c': 2.0},
             'exploration_only': {},
-            'exploitation_only': {}
+            'exploitation_only': {},
+            'thompson_sampling': {'family': 'bernoulli'}
         }
         
+    def spawn_rng(self) -> np.random.Generator:
+        """
+        Get a new random generator derived from self.seed
+        
+        Each call returns an independent stream (children of one SeedSequence),
+        so the environment, every algorithm and every worker can own a
+        generator while the whole experiment stays reproducible from one seed.
+        """
+        if self._seed_seq is None or self._seed_seq.entropy != self.seed:
+            self._seed_seq = np.random.SeedSequence(self.seed)
+        return np.random.default_rng(self._seed_seq.spawn(1)[0])
+    
     def get_bernoulli_config(self, n_arms: int = 10, n_trials: int = 1000):
         """Get configuration for Bernoulli bandits"""
         self.n_arms = n_arms
         self.n_trials = n_trials
+        rng = self.spawn_rng()
         self.reward_distributions = [
-            {'type': 'bernoulli', 'p': np.random.uniform(0.1, 0.9)} 
+            {'type': 'bernoulli', 'p': rng.uniform(0.1, 0.9)} 
             for _ in range(n_arms)
         ]
         return self
@@ -36,8 +54,9 @@ class MABConfig:
         """Get configuration for Normal bandits"""
         self.n_arms = n_arms
         self.n_trials = n_trials
+        rng = self.spawn_rng()
         self.reward_distributions = [
-            {'type': 'normal', 'mu': np.random.uniform(0, 1), 'sigma': 0.1} 
+            {'type': 'normal', 'mu': rng.uniform(0, 1), 'sigma': 0.1} 
             for _ in range(n_arms)
         ]
         return self
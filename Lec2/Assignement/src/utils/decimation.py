@@ -0,0 +1,140 @@
+import numpy as np
+from typing import Tuple
+
+# Downsampling of long result curves for plotting. Curves are read one bucket
+# (contiguous slice) at a time, in order, so memory-mapped results are never
+# loaded whole and the output size depends only on n_points.
+
+def bucket_edges(n: int, n_buckets: int, log: bool = False) -> np.ndarray:
+    """
+    Boundaries of up to n_buckets contiguous buckets covering range(n)
+    
+    Args:
+        n: Length of the curve
+        n_buckets: Number of buckets wanted
+        log: Space bucket sizes geometrically (equal width on a log x axis)
+    
+    Returns:
+        Increasing array of edges, starting at 0 and ending at n
+    """
+    n_buckets = max(1, min(n_buckets, n))
+    if log:
+        edges = np.geomspace(1, n + 1, n_buckets + 1) - 1
+    else:
+        edges = np.linspace(0, n, n_buckets + 1)
+    return np.unique(np.round(edges).astype(np.int64))
+
+class RunningMean:
+    """
+    Running mean of a sequence, computed slice by slice on access
+    
+    result[start:stop] equals (np.cumsum(values) / np.arange(1, n + 1))[start:stop]
+    without materialising the full cumulative sum. Reading slices in
+    increasing order costs one pass over values in total.
+    """
+    def __init__(self, values: np.ndarray):
+        self.values = values
+        self._position = 0
+        self._total = 0.0
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def __getitem__(self, key: slice) -> np.ndarray:
+        start, stop, step = key.indices(len(self))
+        if step != 1:
+            raise ValueError("RunningMean only supports contiguous slices")
+        if start < self._position:
+            self._position, self._total = 0, 0.0
+        self._total += np.sum(self.values[self._position:start], dtype=float)
+        sums = self._total + np.cumsum(self.values[start:stop], dtype=float)
+        if len(sums):
+            self._position, self._total = stop, sums[-1]
+        else:
+            self._position = start
+        return sums / np.arange(start + 1, stop + 1)
+
+def minmax_decimate(y, n_points: int, log: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep the smallest and largest value of each bucket
+    
+    Every spike of the curve survives, so the plot looks the same as the full
+    one at any resolution below n_points / 2 pixels.
+    
+    Args:
+        y: Curve (array, memmap or RunningMean)
+        n_points: Maximum number of points to return
+        log: Use geometrically growing buckets (for a log x axis)
+    
+    Returns:
+        Indices (increasing) and values of the kept points
+    """
+    n = len(y)
+    if n <= n_points:
+        return np.arange(n), np.asarray(y[0:n], dtype=float)
+    
+    edges = bucket_edges(n, n_points // 2, log)
+    indices = np.empty(2 * (len(edges) - 1), dtype=np.int64)
+    values = np.empty(len(indices))
+    for i, (start, stop) in enumerate(zip(edges[:-1], edges[1:])):
+        bucket = np.asarray(y[start:stop], dtype=float)
+        lo, hi = sorted((int(np.argmin(bucket)), int(np.argmax(bucket))))
+        indices[2 * i:2 * i + 2] = start + lo, start + hi
+        values[2 * i:2 * i + 2] = bucket[lo], bucket[hi]
+    
+    # Buckets where the min and max are the same point
+    keep = np.r_[True, indices[1:] != indices[:-1]]
+    return indices[keep], values[keep]
+
+def lttb_decimate(y, n_points: int, log: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets downsampling (Steinarsson, 2013)
+    
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and the
+    mean of the next bucket. Preserves the visual shape with one point per
+    bucket.
+    
+    Args:
+        y: Curve (array, memmap or RunningMean)
+        n_points: Maximum number of points to return (at least 3)
+        log: Use geometrically growing buckets (for a log x axis)
+    
+    Returns:
+        Indices (increasing) and values of the kept points
+    """
+    n = len(y)
+    if n <= max(n_points, 3):
+        return np.arange(n), np.asarray(y[0:n], dtype=float)
+    
+    # Buckets over the interior points 1 .. n-2
+    edges = 1 + bucket_edges(n - 2, n_points - 2, log)
+    indices = [0]
+    values = [float(np.asarray(y[0:1], dtype=float)[0])]
+    
+    bucket = np.asarray(y[edges[0]:edges[1]], dtype=float)
+    for i in range(len(edges) - 1):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_bucket = np.asarray(y[stop:edges[i + 2]], dtype=float)
+            next_x, next_y = (stop + edges[i + 2] - 1) / 2, next_bucket.mean()
+        else:
+            next_bucket = np.asarray(y[n - 1:n], dtype=float)
+            next_x, next_y = n - 1, next_bucket[0]
+        
+        prev_x, prev_y = indices[-1], values[-1]
+        xs = np.arange(start, stop)
+        areas = np.abs((prev_x - next_x) * (bucket - prev_y) - (prev_x - xs) * (next_y - prev_y))
+        best = int(np.argmax(areas))
+        indices.append(start + best)
+        values.append(bucket[best])
+        bucket = next_bucket
+    
+    indices.append(n - 1)
+    values.append(float(bucket[0]))
+    return np.array(indices), np.array(values)
+
+DECIMATORS = {
+    'minmax': minmax_decimate,
+    'lttb': lttb_decimate
+}
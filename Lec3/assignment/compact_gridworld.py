@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, Sequence, Tuple
+
+import numpy as np
+
+from gridworld import GridWorld, State, Action, Transition, clear_sampling_cache
+
+
+class CompactGridWorld(GridWorld):
+    """``GridWorld`` with array-backed internals.
+
+    Cell ``(r, c)`` has the flat id ``r * cols + c``. Obstacles are a boolean
+    map over cell ids (``blocked``) and ``neighbours[a, i]`` is the cell
+    reached from cell ``i`` by a deterministic move ``ACTIONS[a]``, so moves
+    are table lookups instead of bounds checks and set probes. The ``MDP``
+    interface is unchanged: states are still ``(row, col)`` tuples and
+    ``transitions`` yields exactly what ``GridWorld`` yields. Unlike
+    ``GridWorld``, ``obstacles`` is a frozenset derived from ``blocked``;
+    reassign it (``grid.obstacles = ...``) to rebuild the map and tables.
+    ``transitions`` returns a tuple that is cached per (state, action), so
+    planners that look ahead from the same states repeatedly do not rebuild
+    ``Transition`` objects; the cache is dropped when ``obstacles`` changes.
+    """
+
+    ACTION_IDS: Dict[Action, int] = {a: i for i, a in enumerate(GridWorld.ACTIONS)}
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        start: State,
+        goal: State,
+        obstacles: Sequence[State] | np.ndarray | None = None,
+        step_cost: float = -1.0,
+        goal_reward: float = 0.0,
+        slip: float = 0.1,
+    ) -> None:
+        super().__init__(rows, cols, start, goal, None, step_cost, goal_reward, slip)
+        self.obstacles = obstacles
+
+    @classmethod
+    def from_grid(cls, grid: GridWorld) -> "CompactGridWorld":
+        return cls(grid.rows, grid.cols, grid.start, grid.goal, list(grid.obstacles),
+                   grid.step_cost, grid.goal_reward, grid.slip)
+
+    @property
+    def n_cells(self) -> int:
+        return self.rows * self.cols
+
+    @property
+    def obstacles(self) -> frozenset:
+        """Obstacle cells, read-only: assign a new collection (or map) to change them."""
+        return frozenset(self.state_at(i) for i in np.flatnonzero(self.blocked).tolist())
+
+    @obstacles.setter
+    def obstacles(self, obstacles: Sequence[State] | np.ndarray | None) -> None:
+        """Obstacle cells as (row, col) pairs or a (rows, cols) boolean map."""
+        if isinstance(obstacles, np.ndarray) and obstacles.dtype == bool:
+            if obstacles.shape != (self.rows, self.cols):
+                raise ValueError(f"obstacle map must have shape {(self.rows, self.cols)}, got {obstacles.shape}")
+            blocked = obstacles.ravel().copy()
+        else:
+            blocked = np.zeros(self.n_cells, dtype=bool)
+            for r, c in obstacles if obstacles is not None else ():
+                if self._in_bounds(r, c):
+                    blocked[r * self.cols + c] = True
+        self.blocked = blocked
+        self.neighbours = self._neighbour_table()
+        # scalar lookups go through memoryviews, which yield Python ints and
+        # bools instead of NumPy scalars
+        self._blocked_view = memoryview(self.blocked)
+        self._neighbour_view = memoryview(self.neighbours)
+        self._transitions: Dict[Tuple[State, Action], Tuple[Transition, ...]] = {}
+        # outcome tables sampled from the old map are stale now
+        clear_sampling_cache(self)
+        import sampling  # here, not at the top: sampling imports this module
+
+        sampling.clear_batch_samplers(self)
+
+    def _neighbour_table(self) -> np.ndarray:
+        cells = np.arange(self.n_cells, dtype=np.int64)
+        r, c = np.divmod(cells, self.cols)
+        dtype = np.int32 if self.n_cells <= np.iinfo(np.int32).max else np.int64
+        table = np.empty((len(self.ACTIONS), self.n_cells), dtype=dtype)
+        for a, action in enumerate(self.ACTIONS):
+            dr, dc = self.DELTAS[action]
+            nr, nc = r + dr, c + dc
+            ok = (nr >= 0) & (nr < self.rows) & (nc >= 0) & (nc < self.cols)
+            target = np.where(ok, nr * self.cols + nc, cells)
+            ok &= ~self.blocked[target]
+            table[a] = np.where(ok, target, cells)
+        return table
+
+    def state_id(self, state: State) -> int:
+        r, c = state
+        if not self._in_bounds(r, c):
+            raise ValueError(f"state {state} is outside the {self.rows}x{self.cols} grid")
+        return r * self.cols + c
+
+    def state_at(self, i: int) -> State:
+        return divmod(int(i), self.cols)
+
+    def free_ids(self) -> np.ndarray:
+        return np.flatnonzero(~self.blocked)
+
+    def _blocked(self, r: int, c: int) -> bool:
+        return self._blocked_view[r * self.cols + c] if self._in_bounds(r, c) else False
+
+    def _move(self, state: State, action: Action) -> State:
+        r, c = state
+        cols = self.cols
+        if not (0 <= r < self.rows and 0 <= c < cols):
+            return super()._move(state, action)
+        i = r * cols + c
+        j = self._neighbour_view[self.ACTION_IDS[action], i]
+        return state if j == i else divmod(j, cols)
+
+    def transitions(self, state: State, action: Action) -> Tuple[Transition, ...]:
+        key = (state, action)
+        try:
+            return self._transitions[key]
+        except KeyError:
+            outcomes = self._transitions[key] = tuple(super().transitions(state, action))
+            return outcomes
+
+    def value_table(self) -> "DenseValueTable":
+        return DenseValueTable(self)
+
+
+class DenseValueTable(MutableMapping):
+    """Mapping from ``CompactGridWorld`` states to floats stored in flat arrays.
+
+    ``values[i]`` is the value of cell id ``i`` and ``known[i]`` tells whether
+    it has been set, so ``in``, ``get`` and ``setdefault`` behave as for the
+    ``dict`` RTDP uses on other MDPs, at 9 bytes per cell. The façade still
+    costs about twice a dict lookup per access, so integer-id code should
+    read and write ``values`` directly. States outside the grid are never
+    present.
+    """
+
+    def __init__(self, grid: CompactGridWorld) -> None:
+        self.grid = grid
+        self._rows, self._cols = grid.rows, grid.cols
+        self.values = np.zeros(grid.n_cells)
+        self.known = np.zeros(grid.n_cells, dtype=bool)
+        # scalar access through memoryviews avoids creating NumPy scalars
+        self._values = memoryview(self.values)
+        self._known = memoryview(self.known)
+
+    # the dunder methods inline the (row, col) -> id mapping: they sit on
+    # RTDP's hot path, where every extra call shows
+    def __contains__(self, s: object) -> bool:
+        try:
+            r, c = s
+            return 0 <= r < self._rows and 0 <= c < self._cols and self._known[r * self._cols + c]
+        except (TypeError, ValueError):
+            return False
+
+    def __getitem__(self, s: State) -> float:
+        try:
+            r, c = s
+            if 0 <= r < self._rows and 0 <= c < self._cols:
+                i = r * self._cols + c
+                if self._known[i]:
+                    return self._values[i]
+        except (TypeError, ValueError):
+            pass
+        raise KeyError(s)
+
+    def __setitem__(self, s: State, value: float) -> None:
+        try:
+            r, c = s
+            inside = 0 <= r < self._rows and 0 <= c < self._cols
+        except (TypeError, ValueError):
+            inside = False
+        if not inside:
+            raise KeyError(s)
+        i = r * self._cols + c
+        self._values[i] = value
+        self._known[i] = True
+
+    def __delitem__(self, s: State) -> None:
+        if s not in self:
+            raise KeyError(s)
+        i = self.grid.state_id(s)
+        self._known[i] = False
+        self._values[i] = 0.0
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.known))
+
+    def __iter__(self) -> Iterator[State]:
+        return (self.grid.state_at(i) for i in np.flatnonzero(self.known).tolist())
+
+    def as_array(self, fill: float = 0.0) -> np.ndarray:
+        """Values as a (rows, cols) array, ``fill`` where unset."""
+        return np.where(self.known, self.values, fill).reshape(self.grid.rows, self.grid.cols)
+
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from gridworld import MDP, GridWorld, State, Action
+from compact_gridworld import CompactGridWorld
+
+
+@dataclass
+class CompiledMDP:
+    """Integer-indexed transition model of a finite MDP.
+
+    Row ``s * n_actions + a`` of the CSR arrays holds the outcomes of action
+    ``a`` in state ``s``: entries ``indptr[row]:indptr[row + 1]`` of
+    ``next_state``, ``probability`` and ``reward``. Rows of actions that are
+    not available in ``s`` (and all rows of terminal states) are empty.
+    """
+
+    states: List[State]
+    actions: List[Action]
+    state_index: Dict[State, int]
+    action_index: Dict[Action, int]
+    terminal: np.ndarray  # (n_states,) bool
+    action_mask: np.ndarray  # (n_states, n_actions) bool
+    indptr: np.ndarray  # (n_states * n_actions + 1,) int64
+    next_state: np.ndarray  # (nnz,) int64
+    probability: np.ndarray  # (nnz,) float64
+    reward: np.ndarray  # (nnz,) float64
+    initial_state: int = 0
+
+    @property
+    def n_states(self) -> int:
+        return len(self.states)
+
+    @property
+    def n_actions(self) -> int:
+        return len(self.actions)
+
+    def row(self, s: int, a: int) -> slice:
+        r = s * self.n_actions + a
+        return slice(self.indptr[r], self.indptr[r + 1])
+
+    def outcomes(self, s: int, a: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        sl = self.row(s, a)
+        return self.next_state[sl], self.probability[sl], self.reward[sl]
+
+    def expected_reward(self) -> np.ndarray:
+        """E[r | s, a] as an (n_states, n_actions) array (0 for empty rows)."""
+        rows = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        sums = np.bincount(rows, weights=self.probability * self.reward, minlength=len(self.indptr) - 1)
+        return sums.reshape(self.n_states, self.n_actions)
+
+
+def compile_mdp(mdp: MDP, states: Iterable[State] | None = None) -> CompiledMDP:
+    """Enumerate the states reachable from ``states`` (default: the initial
+    state) breadth-first and tabulate their transitions.
+
+    Outcomes of the same (state, action) with equal next state and reward are
+    merged into one entry with the summed probability, in order of first
+    occurrence.
+    """
+    frontier = list(states) if states is not None else [mdp.initial_state()]
+    state_index: Dict[State, int] = {}
+    ordered: List[State] = []
+    queue = deque()
+    for s in frontier:
+        if s not in state_index:
+            state_index[s] = len(ordered)
+            ordered.append(s)
+            queue.append(s)
+
+    action_index: Dict[Action, int] = {}
+    actions: List[Action] = []
+    # per state: list of (action, [(next_state, probability, reward), ...])
+    tables: List[List[Tuple[Action, List[Tuple[State, float, float]]]]] = []
+    terminal: List[bool] = []
+
+    while queue:
+        s = queue.popleft()
+        terminal.append(mdp.is_terminal(s))
+        state_actions: Sequence[Action] = () if terminal[-1] else mdp.actions(s)
+        rows = []
+        for a in state_actions:
+            if a not in action_index:
+                action_index[a] = len(actions)
+                actions.append(a)
+            merged: Dict[Tuple[State, float], int] = {}
+            outcomes: List[Tuple[State, float, float]] = []
+            for t in mdp.transitions(s, a):
+                if t.probability <= 0.0:
+                    continue
+                key = (t.next_state, t.reward)
+                if key in merged:
+                    i = merged[key]
+                    ns, p, r = outcomes[i]
+                    outcomes[i] = (ns, p + t.probability, r)
+                else:
+                    merged[key] = len(outcomes)
+                    outcomes.append((t.next_state, t.probability, t.reward))
+                if t.next_state not in state_index:
+                    state_index[t.next_state] = len(ordered)
+                    ordered.append(t.next_state)
+                    queue.append(t.next_state)
+            rows.append((a, outcomes))
+        tables.append(rows)
+
+    n_states, n_actions = len(ordered), len(actions)
+    action_mask = np.zeros((n_states, n_actions), dtype=bool)
+    counts = np.zeros(n_states * n_actions, dtype=np.int64)
+    for s, rows in enumerate(tables):
+        for a, outcomes in rows:
+            ai = action_index[a]
+            action_mask[s, ai] = True
+            counts[s * n_actions + ai] = len(outcomes)
+
+    indptr = np.zeros(n_states * n_actions + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    nnz = int(indptr[-1])
+    next_state = np.empty(nnz, dtype=np.int64)
+    probability = np.empty(nnz, dtype=np.float64)
+    reward = np.empty(nnz, dtype=np.float64)
+    for s, rows in enumerate(tables):
+        for a, outcomes in rows:
+            start = indptr[s * n_actions + action_index[a]]
+            for k, (ns, p, r) in enumerate(outcomes):
+                next_state[start + k] = state_index[ns]
+                probability[start + k] = p
+                reward[start + k] = r
+
+    return CompiledMDP(
+        states=ordered,
+        actions=actions,
+        state_index=state_index,
+        action_index=action_index,
+        terminal=np.array(terminal, dtype=bool),
+        action_mask=action_mask,
+        indptr=indptr,
+        next_state=next_state,
+        probability=probability,
+        reward=reward,
+        initial_state=state_index.get(mdp.initial_state(), 0),
+    )
+
+
+def compile_gridworld(grid: GridWorld) -> CompiledMDP:
+    """Vectorized ``compile_mdp`` for a ``GridWorld``.
+
+    Every free cell becomes a state (row-major order, reachable or not), so
+    the model is built with array operations only and scales to millions of
+    cells. Transitions match ``GridWorld.transitions`` after merging.
+    """
+    rows, cols = grid.rows, grid.cols
+    if isinstance(grid, CompactGridWorld):
+        free = ~grid.blocked.reshape(rows, cols)
+    else:
+        free = np.ones((rows, cols), dtype=bool)
+        for r, c in grid.obstacles:
+            if grid._in_bounds(r, c):
+                free[r, c] = False
+    cells = np.flatnonzero(free)
+    n_states = len(cells)
+    cell_id = np.full(rows * cols, -1, dtype=np.int64)
+    cell_id[cells] = np.arange(n_states)
+    r, c = np.divmod(cells, cols)
+
+    def move(action: Action) -> np.ndarray:
+        dr, dc = grid.DELTAS[action]
+        nr, nc = r + dr, c + dc
+        ok = (nr >= 0) & (nr < rows) & (nc >= 0) & (nc < cols)
+        target = np.where(ok, nr * cols + nc, 0)
+        ok &= free.ravel()[target]
+        return np.where(ok, cell_id[target], np.arange(n_states))
+
+    actions = list(grid.ACTIONS)
+    moves = {a: move(a) for a in actions}
+    perpendiculars = {a: ("L", "R") if a in ("U", "D") else ("U", "D") for a in actions}
+    # candidate outcomes per (state, action): intended move, then both slips
+    cand = np.stack([np.stack([moves[a], moves[perpendiculars[a][0]], moves[perpendiculars[a][1]]], axis=1)
+                     for a in actions], axis=1)  # (n_states, n_actions, 3)
+    prob = np.empty(cand.shape)
+    prob[..., 0] = 1.0 - grid.slip
+    prob[..., 1:] = grid.slip / 2.0
+
+    goal = grid.goal
+    goal_id = int(cell_id[goal[0] * cols + goal[1]]) if grid._in_bounds(*goal) else -1
+    terminal = np.zeros(n_states, dtype=bool)
+    if goal_id >= 0:
+        terminal[goal_id] = True
+
+    # merge equal next states into their first occurrence (reward depends on
+    # the next state only), dropping zero-probability outcomes first
+    valid = prob > 0.0
+    valid[terminal] = False
+    for j in (1, 2):
+        for i in range(j):
+            same = valid[..., i] & valid[..., j] & (cand[..., i] == cand[..., j])
+            prob[..., i][same] += prob[..., j][same]
+            valid[..., j][same] = False
+
+    reward = np.where(cand == goal_id, grid.goal_reward, grid.step_cost)
+    indptr = np.zeros(n_states * len(actions) + 1, dtype=np.int64)
+    np.cumsum(valid.sum(axis=2).ravel(), out=indptr[1:])
+    action_mask = np.repeat(~terminal[:, None], len(actions), axis=1)
+
+    states = list(zip(r.tolist(), c.tolist()))
+    return CompiledMDP(
+        states=states,
+        actions=actions,
+        state_index={s: i for i, s in enumerate(states)},
+        action_index={a: i for i, a in enumerate(actions)},
+        terminal=terminal,
+        action_mask=action_mask,
+        indptr=indptr,
+        next_state=cand[valid],
+        probability=prob[valid],
+        reward=reward[valid].astype(np.float64),
+        initial_state=int(cell_id[grid.start[0] * cols + grid.start[1]]) if grid._in_bounds(*grid.start) else 0,
+    )
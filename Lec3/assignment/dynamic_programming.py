@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from gridworld import MDP, GridWorld, State, Action
+from compact_gridworld import CompactGridWorld
+from compiled_mdp import CompiledMDP, compile_mdp, compile_gridworld
+
+
+@dataclass
+class DPConfig:
+    gamma: float = 0.95
+    tol: float = 1e-6  # stop when the Bellman residual max|V' - V| drops below tol
+    max_iterations: int = 10_000
+    sweep: str = "jacobi"  # or "gauss_seidel": in place, layer by layer outward from terminal states (see _plan)
+    block_size: int = 4096  # most states per in-place block (larger layers are split)
+    evaluation_sweeps: int = 20  # policy evaluation sweeps per improvement (policy iteration)
+
+
+@dataclass
+class DPSolution:
+    model: CompiledMDP
+    V: np.ndarray  # (n_states,)
+    policy: np.ndarray  # (n_states,) action index, -1 where no action is available
+    iterations: int
+    residual: float
+    converged: bool
+
+    def value(self, s: State) -> float:
+        return float(self.V[self.model.state_index[s]])
+
+    def action(self, s: State) -> Action | None:
+        a = self.policy[self.model.state_index[s]]
+        return None if a < 0 else self.model.actions[a]
+
+
+def as_compiled(mdp: MDP | CompiledMDP) -> CompiledMDP:
+    if isinstance(mdp, CompiledMDP):
+        return mdp
+    if type(mdp) in (GridWorld, CompactGridWorld):
+        return compile_gridworld(mdp)
+    return compile_mdp(mdp)
+
+
+class _Rows:
+    """Sparse rows of (next state, probability) pairs.
+
+    Rows with at most a few outcomes (the common case) are stored padded, one
+    array per outcome slot, so a backup is a handful of gathers and fused
+    multiply-adds; otherwise rows stay in CSR form and are reduced with
+    ``np.bincount``.
+    """
+
+    def __init__(self, indptr: np.ndarray, next_state: np.ndarray, probability: np.ndarray) -> None:
+        lengths = np.diff(indptr)
+        n_rows = len(lengths)
+        width = int(lengths.max(initial=0))
+        self.padded = width * n_rows <= 2 * len(next_state)
+        if self.padded:
+            present = np.arange(width)[:, None] < lengths
+            positions = (indptr[:-1] + np.arange(width)[:, None])[present]
+            self.next = np.zeros((width, n_rows), dtype=np.intp)
+            self.next[present] = next_state[positions]
+            self.prob = np.zeros((width, n_rows))
+            self.prob[present] = probability[positions]
+        else:
+            self.indptr, self.next, self.prob = indptr, next_state, probability
+            self.row_of = np.repeat(np.arange(n_rows), lengths)
+
+    def expect(self, V: np.ndarray, lo: int, hi: int, out: np.ndarray | None = None) -> np.ndarray:
+        """sum_k p_k * V[next_k] for rows lo..hi-1."""
+        if out is None:
+            out = np.empty(hi - lo)
+        if not self.padded:
+            e0, e1 = self.indptr[lo], self.indptr[hi]
+            out[:] = np.bincount(self.row_of[e0:e1] - lo, weights=self.prob[e0:e1] * V[self.next[e0:e1]],
+                                 minlength=hi - lo)
+            return out
+        out[:] = 0.0
+        term = np.empty(hi - lo)
+        for k in range(len(self.prob)):
+            # indices are valid, so "clip" only skips the bounds check
+            np.take(V, self.next[k, lo:hi], out=term, mode="clip")
+            term *= self.prob[k, lo:hi]
+            out += term
+        return out
+
+    def select(self, rows: np.ndarray, keep: np.ndarray) -> "_Rows":
+        """Rows ``rows`` as a new row set; rows where ``keep`` is False are empty."""
+        new = _Rows.__new__(_Rows)
+        new.padded = self.padded
+        if self.padded:
+            new.next = self.next[:, rows]
+            new.prob = self.prob[:, rows] * keep
+            return new
+        lengths = np.where(keep, self.indptr[rows + 1] - self.indptr[rows], 0)
+        new.indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=new.indptr[1:])
+        entries = np.arange(new.indptr[-1]) - np.repeat(new.indptr[:-1] - self.indptr[rows], lengths)
+        new.next, new.prob = self.next[entries], self.prob[entries]
+        new.row_of = np.repeat(np.arange(len(rows)), lengths)
+        return new
+
+
+class _Bellman:
+    """Backups over the transition arrays of a compiled MDP.
+
+    States are backed up in ``blocks`` of consecutive indices (all at once
+    by default). Rows are laid out block after block and action-major within
+    a block (row ``A * lo + a * (hi - lo) + s - lo``), so the Q-values of a
+    block are one contiguous (n_actions, hi - lo) computation. With
+    ``order``, state ``order[i]`` of the model is state ``i`` here; use
+    ``to_model``/``from_model`` to convert per-state arrays.
+    """
+
+    def __init__(self, model: CompiledMDP, gamma: float, order: np.ndarray | None = None,
+                 blocks: List[Tuple[int, int]] | None = None) -> None:
+        S, A = model.n_states, model.n_actions
+        self.model = model
+        self.gamma = gamma
+        self.n_states = S
+        self.n_actions = A
+        self.order = order
+        self.blocks = blocks if blocks is not None else [(0, S)]
+        states = np.arange(S) if order is None else order
+        starts = np.array([lo for lo, _ in self.blocks], dtype=np.intp)
+        size = np.array([hi - lo for lo, hi in self.blocks], dtype=np.intp)
+        block = np.repeat(np.arange(len(self.blocks)), size)
+        self.base = np.arange(S) + (A - 1) * starts[block]
+        self.stride = size[block]
+        layout = np.empty(S * A, dtype=np.intp)
+        for a in range(A):
+            layout[self.row(np.arange(S), a)] = states * A + a
+        by_state = _Rows(model.indptr, model.next_state, model.probability)
+        self.rows = by_state.select(layout, np.ones(S * A, dtype=bool))
+        if order is not None:
+            rank = np.empty(S, dtype=np.intp)
+            rank[order] = np.arange(S)
+            self.rows.next = rank[self.rows.next]
+        # unavailable actions get -inf so that max/argmax skip them
+        self.r = np.where(model.action_mask, model.expected_reward(), -np.inf).ravel()[layout]
+        self.dead = np.flatnonzero(~model.action_mask[states].any(axis=1))
+
+    def row(self, s: np.ndarray, a: np.ndarray | int) -> np.ndarray:
+        """Row of action ``a`` in state ``s`` (sweep order)."""
+        return self.base[s] + a * self.stride[s]
+
+    def from_model(self, x: np.ndarray) -> np.ndarray:
+        return x if self.order is None else x[self.order]
+
+    def to_model(self, x: np.ndarray) -> np.ndarray:
+        if self.order is None:
+            return x
+        out = np.empty_like(x)
+        out[self.order] = x
+        return out
+
+    def q(self, V: np.ndarray, lo: int, hi: int) -> np.ndarray:
+        """Q(s, a) for the block lo..hi-1 as an (n_actions, hi - lo) array, -inf for unavailable actions."""
+        r0, r1 = self.n_actions * lo, self.n_actions * hi
+        Q = self.rows.expect(V, r0, r1)
+        Q *= self.gamma
+        Q += self.r[r0:r1]
+        return Q.reshape(self.n_actions, hi - lo)
+
+    def _dead(self, lo: int, hi: int) -> np.ndarray:
+        i, j = np.searchsorted(self.dead, [lo, hi])
+        return self.dead[i:j] - lo
+
+    def backup(self, V: np.ndarray, lo: int, hi: int) -> np.ndarray:
+        """max_a Q(s, a) for the block lo..hi-1 (0 without actions)."""
+        values = self.q(V, lo, hi).max(axis=0)
+        values[self._dead(lo, hi)] = 0.0
+        return values
+
+    def greedy(self, V: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """max_a Q and argmax_a Q for every state (0 and -1 without actions)."""
+        values = np.empty(self.n_states)
+        best = np.empty(self.n_states, dtype=np.intp)
+        for lo, hi in self.blocks:
+            Q = self.q(V, lo, hi)
+            best[lo:hi] = np.argmax(Q, axis=0)
+            values[lo:hi] = Q[best[lo:hi], np.arange(hi - lo)]
+        values[self.dead] = 0.0
+        best[self.dead] = -1
+        return values, best
+
+
+def _outward_order(model: CompiledMDP) -> Tuple[np.ndarray, np.ndarray]:
+    """States sorted by their distance (in transitions) to a terminal state,
+    and those distances; states that cannot reach one come last."""
+    S, A = model.n_states, model.n_actions
+    source = np.repeat(np.arange(S * A) // A, np.diff(model.indptr))
+    target = model.next_state
+    edge = (model.probability > 0.0) & (source != target)
+    # predecessors of each state, CSR by target
+    by_target = np.argsort(target[edge], kind="stable")
+    source = source[edge][by_target]
+    start = np.searchsorted(target[edge][by_target], np.arange(S + 1))
+
+    distance = np.full(S, -1, dtype=np.int64)
+    frontier = np.flatnonzero(model.terminal)
+    distance[frontier] = 0
+    d = 0
+    while len(frontier):
+        d += 1
+        counts = start[frontier + 1] - start[frontier]
+        edges = np.repeat(start[frontier] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        frontier = np.unique(source[edges])
+        frontier = frontier[distance[frontier] < 0]
+        distance[frontier] = d
+    distance[distance < 0] = d
+    order = np.argsort(distance, kind="stable")
+    return order, distance[order]
+
+
+def _plan(model: CompiledMDP, cfg: DPConfig) -> Tuple[np.ndarray | None, List[Tuple[int, int]]]:
+    """State order and (lo, hi) blocks of one sweep.
+
+    Blocks are backed up one after the other, each with the values the
+    earlier blocks of the sweep just produced. Within a block the update is
+    simultaneous, so for ``"gauss_seidel"`` the states are ordered outward
+    from the terminal states and every block is (part of) one distance
+    layer: a layer's best moves lead into the layer before, which is already
+    updated, and values propagate across the whole grid in one sweep
+    (row-major blocks of ``block_size`` states need as many sweeps as
+    Jacobi). Each block costs a few NumPy calls, so this pays off for value
+    iteration on large grids; policy iteration's many evaluation sweeps are
+    usually faster with Jacobi.
+    """
+    n = model.n_states
+    if cfg.sweep == "jacobi":
+        return None, [(0, n)]
+    if cfg.sweep == "gauss_seidel":
+        order, distance = _outward_order(model)
+        size = max(1, cfg.block_size)
+        edges = [0] + (np.flatnonzero(np.diff(distance)) + 1).tolist() + [n]
+        blocks = [(lo, min(lo + size, hi)) for first, hi in zip(edges, edges[1:]) for lo in range(first, hi, size)]
+        return order, blocks
+    raise ValueError(f"unknown sweep: {cfg.sweep}")
+
+
+def _initial_values(bellman: _Bellman, cfg: DPConfig, V0: np.ndarray | None) -> np.ndarray:
+    """``V0`` in sweep order. Without it Jacobi starts from 0 and Gauss-Seidel
+    from the lower bound min(r, 0) / (1 - gamma) (0 where no action is
+    available): from below, the max in a backup follows the states that
+    were already updated instead of stale optimistic zeros."""
+    if V0 is not None:
+        return bellman.from_model(np.array(V0, dtype=np.float64))
+    V = np.zeros(bellman.n_states)
+    if bellman.order is not None and cfg.gamma < 1.0:
+        V[:] = min(float(bellman.model.reward.min(initial=0.0)), 0.0) / (1.0 - cfg.gamma)
+        V[bellman.dead] = 0.0
+    return V
+
+
+def _sweep(bellman: _Bellman, V: np.ndarray) -> float:
+    """One backup of every state; returns the Bellman residual."""
+    residual = 0.0
+    for lo, hi in bellman.blocks:
+        values = bellman.backup(V, lo, hi)
+        residual = max(residual, float(np.max(np.abs(values - V[lo:hi]), initial=0.0)))
+        V[lo:hi] = values
+    return residual
+
+
+def value_iteration(mdp: MDP | CompiledMDP, cfg: DPConfig | None = None, V0: np.ndarray | None = None) -> DPSolution:
+    cfg = cfg or DPConfig()
+    model = as_compiled(mdp)
+    order, blocks = _plan(model, cfg)
+    bellman = _Bellman(model, cfg.gamma, order, blocks)
+    V = _initial_values(bellman, cfg, V0)
+
+    residual = np.inf
+    iterations = 0
+    while iterations < cfg.max_iterations and residual >= cfg.tol:
+        residual = _sweep(bellman, V)
+        iterations += 1
+
+    _, policy = bellman.greedy(V)
+    return DPSolution(model, bellman.to_model(V), bellman.to_model(policy), iterations, residual, residual < cfg.tol)
+
+
+def _evaluate(bellman: _Bellman, V: np.ndarray, policy: np.ndarray, sweeps: int) -> None:
+    """Partial policy evaluation: ``sweeps`` backups of V under the fixed policy."""
+    acting = policy >= 0
+    rows = bellman.row(np.arange(len(policy)), np.maximum(policy, 0))
+    transitions = bellman.rows.select(rows, acting)
+    r_pi = np.where(acting, bellman.r[rows], 0.0)
+    for _ in range(sweeps):
+        for lo, hi in bellman.blocks:
+            expected = transitions.expect(V, lo, hi)
+            expected *= bellman.gamma
+            expected += r_pi[lo:hi]
+            V[lo:hi] = expected
+
+
+def policy_iteration(mdp: MDP | CompiledMDP, cfg: DPConfig | None = None, V0: np.ndarray | None = None) -> DPSolution:
+    """Modified policy iteration: greedy improvement, then ``evaluation_sweeps``
+    backups under the improved policy. Stops on the improvement step's
+    Bellman residual, like value iteration (which is the case
+    ``evaluation_sweeps=0``)."""
+    cfg = cfg or DPConfig()
+    model = as_compiled(mdp)
+    order, blocks = _plan(model, cfg)
+    bellman = _Bellman(model, cfg.gamma, order, blocks)
+    V = _initial_values(bellman, cfg, V0)
+
+    residual = np.inf
+    iterations = 0
+    while iterations < cfg.max_iterations:
+        values, policy = bellman.greedy(V)
+        residual = float(np.max(np.abs(values - V), initial=0.0))
+        V = values
+        iterations += 1
+        if residual < cfg.tol:
+            break
+        _evaluate(bellman, V, policy, cfg.evaluation_sweeps)
+
+    _, policy = bellman.greedy(V)
+    return DPSolution(model, bellman.to_model(V), bellman.to_model(policy), iterations, residual, residual < cfg.tol)
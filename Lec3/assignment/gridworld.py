@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import weakref
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, List, MutableMapping, Sequence, Tuple
 
 
 State = Tuple[int, int]
@@ -28,6 +30,10 @@ class MDP:
     def transitions(self, state: State, action: Action) -> Iterable[Transition]:
         raise NotImplementedError
 
+    def value_table(self) -> MutableMapping[State, float]:
+        """Empty state -> value mapping for planners on this MDP (a dict by default)."""
+        return {}
+
 
 class GridWorld(MDP):
     ACTIONS: Sequence[Action] = ("U", "D", "L", "R")
@@ -106,18 +112,46 @@ class GridWorld(MDP):
             yield Transition(next_s, slip_each, reward)
 
 
+# Per-MDP cache of (state, action) -> (cumulative probabilities, outcomes),
+# in the order transitions() yields them. Entries go away with the MDP.
+_OUTCOME_TABLES: "weakref.WeakKeyDictionary[MDP, Dict[Tuple[State, Action], tuple]]" = weakref.WeakKeyDictionary()
+
+
+def clear_sampling_cache(mdp: MDP | None = None) -> None:
+    """Forget cached outcome tables (call after changing an MDP's dynamics)."""
+    if mdp is None:
+        _OUTCOME_TABLES.clear()
+    else:
+        _OUTCOME_TABLES.pop(mdp, None)
+
+
+def _outcome_table(mdp: MDP, state: State, action: Action) -> Tuple[Tuple[float, ...], Tuple[Tuple[State, float], ...]]:
+    try:
+        tables = _OUTCOME_TABLES[mdp]
+    except KeyError:
+        tables = _OUTCOME_TABLES[mdp] = {}
+    key = (state, action)
+    table = tables.get(key)
+    if table is None:
+        acc = 0.0
+        cumulative = []
+        outcomes = []
+        for t in mdp.transitions(state, action):
+            acc += t.probability
+            cumulative.append(acc)
+            outcomes.append((t.next_state, t.reward))
+        table = tables[key] = (tuple(cumulative), tuple(outcomes))
+    return table
+
+
 def sample_next_state_and_reward(mdp: MDP, state: State, action: Action, rng) -> Tuple[State, float]:
     r = rng.random()
-    acc = 0.0
-    chosen_next = state
-    chosen_reward = 0.0
-    for t in mdp.transitions(state, action):
-        acc += t.probability
-        if r <= acc:
-            chosen_next = t.next_state
-            chosen_reward = t.reward
-            break
-    return chosen_next, chosen_reward
+    cumulative, outcomes = _outcome_table(mdp, state, action)
+    # first outcome whose cumulative probability reaches r
+    i = bisect_left(cumulative, r)
+    if i < len(outcomes):
+        return outcomes[i]
+    return state, 0.0
 
 
 def make_default_grid() -> GridWorld:
@@ -136,3 +170,22 @@ def make_default_grid() -> GridWorld:
         slip=0.2,
     )
 
+
+def make_random_grid(rows: int, cols: int, obstacle_density: float = 0.2, slip: float = 0.2, seed: int = 0) -> GridWorld:
+    """Grid from the bottom-left to the top-right corner with random obstacles.
+
+    Obstacles are drawn independently per cell (never on the start or goal),
+    so the goal is not guaranteed to be reachable at high densities.
+    """
+    import random
+
+    rng = random.Random(seed)
+    start = (rows - 1, 0)
+    goal = (0, cols - 1)
+    obstacles = [
+        (r, c)
+        for r in range(rows)
+        for c in range(cols)
+        if (r, c) not in (start, goal) and rng.random() < obstacle_density
+    ]
+    return GridWorld(rows=rows, cols=cols, start=start, goal=goal, obstacles=obstacles, slip=slip)
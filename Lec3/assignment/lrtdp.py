@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Dict, List, Set
+
+from gridworld import MDP, State, sample_next_state_and_reward
+from rtdp import RTDP, RTDPConfig, LinearDecay
+
+
+@dataclass
+class LRTDPConfig(RTDPConfig):
+    episodes: int = 10_000  # upper bound on trials; labeled runs usually stop much earlier
+    residual_tol: float = 1e-4  # a state is solved once |backup(s) - V(s)| <= residual_tol over its greedy envelope
+    labeled: bool = True  # False: plain RTDP.run for exactly `episodes` trials (baseline)
+
+
+class LRTDP(RTDP):
+    """Labeled RTDP (Bonet & Geffner, 2003) on top of your ``RTDP``.
+
+    After each trial the visited states are checked in reverse order: a state
+    is labeled solved when every state reachable from it under the greedy
+    policy (stopping at solved states) has a residual of at most
+    ``residual_tol``. Trials stop at solved states, and ``run`` ends as soon
+    as the initial state is solved. Backups and greedy actions are
+    ``RTDP.bellman_backup`` and ``RTDP.select_action``, so this only runs once
+    those are implemented. ``backups`` counts Bellman backups, so a run with
+    ``labeled=False`` (``RTDP.run``) gives the plain RTDP cost for comparison.
+    """
+
+    def __init__(self, mdp: MDP, cfg: LRTDPConfig, rng=None, heuristic=None) -> None:
+        super().__init__(mdp, cfg, rng, heuristic)
+        self.solved: Set[State] = set()
+        self.backups = 0
+        self.trials = 0
+
+    def bellman_backup(self, s: State) -> float:
+        self.backups += 1
+        return super().bellman_backup(s)
+
+    def residual(self, s: State) -> float:
+        """|backup(s) - V(s)|, leaving V(s) unchanged (not counted as a backup)."""
+        old = self.value(s)
+        new = super().bellman_backup(s)
+        self.V[s] = old
+        return abs(new - old)
+
+    def is_solved(self, s: State) -> bool:
+        return s in self.solved or self.mdp.is_terminal(s)
+
+    def _greedy_successors(self, s: State) -> List[State]:
+        if not self.mdp.actions(s):
+            return []
+        a = self.select_action(s, 0.0)
+        return [t.next_state for t in self.mdp.transitions(s, a) if t.probability > 0.0]
+
+    def check_solved(self, s: State) -> bool:
+        """Label the greedy envelope of ``s`` solved if all its residuals are small,
+        otherwise back up the states found."""
+        if self.is_solved(s):
+            return True
+        converged = True
+        open_: List[State] = [s]
+        seen: Set[State] = {s}
+        closed: List[State] = []
+        while open_:
+            s = open_.pop()
+            closed.append(s)
+            if self.residual(s) > self.cfg.residual_tol:
+                converged = False
+                continue
+            for ns in self._greedy_successors(s):
+                if ns not in seen and not self.is_solved(ns):
+                    seen.add(ns)
+                    open_.append(ns)
+        if converged:
+            self.solved.update(closed)
+        else:
+            for s in reversed(closed):
+                self.bellman_backup(s)
+        return converged
+
+    def envelope_residual(self, s: State) -> float:
+        """Largest residual over the states reachable from ``s`` under the
+        greedy policy (ignores labels, does not change V)."""
+        largest = 0.0
+        open_: List[State] = [s]
+        seen: Set[State] = {s}
+        while open_:
+            s = open_.pop()
+            if self.mdp.is_terminal(s):
+                continue
+            largest = max(largest, self.residual(s))
+            for ns in self._greedy_successors(s):
+                if ns not in seen:
+                    seen.add(ns)
+                    open_.append(ns)
+        return largest
+
+    def trial(self, epsilon: float = 0.0) -> None:
+        """One labeled trial from the initial state, then label checks back along it."""
+        s = self.mdp.initial_state()
+        visited: List[State] = []
+        steps = 0
+        while steps < self.cfg.max_steps and not self.is_solved(s):
+            visited.append(s)
+            self.bellman_backup(s)
+            a = self.select_action(s, epsilon)
+            s, _ = sample_next_state_and_reward(self.mdp, s, a, self.rng)
+            steps += 1
+        self.trials += 1
+        while visited and self.check_solved(visited.pop()):
+            pass
+
+    def run(self) -> None:
+        if not self.cfg.labeled:
+            super().run()
+            self.trials += self.cfg.episodes
+            return
+        s0 = self.mdp.initial_state()
+        for ep in range(self.cfg.episodes):
+            if self.is_solved(s0):
+                break
+            self.trial(self.cfg.epsilon_schedule.value(ep) if self.cfg.epsilon_schedule else 0.0)
+
+    @property
+    def converged(self) -> bool:
+        return self.is_solved(self.mdp.initial_state())
+
+
+@dataclass
+class _Shifted:
+    """``schedule`` continued from episode ``offset`` (for runs split into chunks)."""
+
+    schedule: LinearDecay
+    offset: int
+
+    def value(self, t: int) -> float:
+        return self.schedule.value(t + self.offset)
+
+
+def compare_with_rtdp(mdp: MDP, cfg: LRTDPConfig, check_every: int = 10, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """Cost of labeled RTDP versus plain RTDP on ``mdp``.
+
+    Labeled RTDP runs until the initial state is solved. Plain RTDP (your
+    ``RTDP.run``, same config and seed, no labels) runs ``check_every``
+    episodes at a time, continuing the epsilon schedule, until the greedy
+    envelope of the initial state has no residual above ``cfg.residual_tol``
+    (so its counts may overshoot by up to ``check_every`` trials), or for at
+    most ``cfg.episodes`` trials.
+
+    Returns:
+        Per method: Bellman ``backups``, ``trials``, the initial state's
+        ``value``, the number of ``states`` with a value, and whether it
+        ``converged``.
+    """
+    import random
+
+    s0 = mdp.initial_state()
+    report = {}
+
+    agent = LRTDP(mdp, cfg, rng=random.Random(seed))
+    agent.run()
+    report["lrtdp"] = agent
+
+    agent = LRTDP(mdp, replace(cfg, labeled=False), rng=random.Random(seed))
+    for start in range(0, cfg.episodes, check_every):
+        schedule = _Shifted(cfg.epsilon_schedule, start) if cfg.epsilon_schedule else None
+        agent.cfg = replace(cfg, labeled=False, episodes=min(check_every, cfg.episodes - start),
+                            epsilon_schedule=schedule)
+        agent.run()
+        if agent.envelope_residual(s0) <= cfg.residual_tol:
+            agent.solved.add(s0)
+            break
+    report["rtdp"] = agent
+
+    return {
+        name: {
+            "backups": agent.backups,
+            "trials": agent.trials,
+            "value": agent.value(s0),
+            "states": len(agent.V),
+            "converged": agent.converged,
+        }
+        for name, agent in report.items()
+    }
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from gridworld import make_default_grid
+from gridworld import make_default_grid, make_random_grid
 from rtdp import RTDP, RTDPConfig, LinearDecay
 from mcts import MCTS, MCTSConfig
+from dynamic_programming import DPConfig, value_iteration
+from lrtdp import LRTDPConfig, compare_with_rtdp
 
 
 def run_rtdp():
@@ -25,9 +27,27 @@ def run_mcts():
     print("MCTS chose:", a)
 
 
+def run_value_iteration():
+    env = make_default_grid()
+    sol = value_iteration(env, DPConfig(gamma=0.95, tol=1e-8))
+    print(f"Value iteration: {sol.iterations} sweeps, V(start) = {sol.value(env.initial_state()):.4f}, "
+          f"best first action = {sol.action(env.initial_state())}")
+
+
+def run_lrtdp():
+    cfg = LRTDPConfig(gamma=0.95, residual_tol=1e-4, episodes=3000)
+    for name, env in (("default 5x6", make_default_grid()), ("random 20x20", make_random_grid(20, 20, seed=0))):
+        report = compare_with_rtdp(env, cfg)
+        for method, r in report.items():
+            print(f"{name:>13} {method:>6}: {r['backups']:>7} backups, {r['trials']:>5} trials, "
+                  f"V(start) = {r['value']:.4f}, converged = {r['converged']}")
+
+
 if __name__ == "__main__":
     # Choose one to test
     # run_rtdp()
     # run_mcts()
+    # run_value_iteration()  # exact baseline to compare against
+    # run_lrtdp()  # labeled RTDP vs plain RTDP backups (needs RTDP done)
     pass
 
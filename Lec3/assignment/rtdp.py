@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import MutableMapping, Tuple
 
 from gridworld import MDP, State, Action, sample_next_state_and_reward
 
@@ -35,7 +35,8 @@ class RTDP:
         self.cfg = cfg
         self.rng = rng
         self.heuristic = heuristic
-        self.V: Dict[State, float] = {}
+        # a dict, or dense arrays with the same interface for a CompactGridWorld
+        self.V: MutableMapping[State, float] = mdp.value_table()
 
         if self.rng is None:
             import random
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import weakref
+from typing import Tuple
+
+import numpy as np
+
+from gridworld import MDP
+from compiled_mdp import CompiledMDP
+from dynamic_programming import as_compiled
+
+
+class BatchSampler:
+    """Samples next states and rewards for many (state, action) pairs at once.
+
+    Works on state/action indices of a ``CompiledMDP`` (``model.state_index``,
+    ``model.action_index``). Each row's cumulative probabilities are computed
+    once; a batch draws one uniform per pair from a NumPy ``Generator`` and
+    finds its outcome by a binary search within the pair's row, vectorized
+    over the batch. As in ``sample_next_state_and_reward``, a pair without
+    outcomes (terminal state, or probabilities summing to less than the draw)
+    stays in its state with reward 0.
+    """
+
+    def __init__(self, model: CompiledMDP) -> None:
+        self.model = model
+        indptr = model.indptr
+        lengths = np.diff(indptr)
+        # cumulative probability within each row, summed in row order
+        self.cumulative = model.probability.copy()
+        starts = indptr[:-1]
+        for k in range(1, int(lengths.max(initial=0))):
+            at = starts[lengths > k] + k
+            self.cumulative[at] += self.cumulative[at - 1]
+        self.depth = int(np.ceil(np.log2(lengths.max(initial=1) + 1)))
+
+    def sample(self, states: np.ndarray, actions: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """Next state indices and rewards for arrays of state and action indices."""
+        m = self.model
+        states = np.asarray(states, dtype=np.int64)
+        rows = states * m.n_actions + np.asarray(actions, dtype=np.int64)
+        u = rng.random(len(rows))
+        lo = m.indptr[rows]
+        end = m.indptr[rows + 1]
+        hi = end.copy()
+        # first entry in [lo, end) with cumulative >= u, or end if none
+        for _ in range(self.depth):
+            active = lo < hi
+            mid = (lo + hi) // 2
+            right = active & (self.cumulative[np.minimum(mid, len(self.cumulative) - 1)] < u)
+            lo = np.where(right, mid + 1, lo)
+            hi = np.where(active & ~right, mid, hi)
+        found = lo < end
+        picked = np.where(found, lo, 0)
+        next_states = np.where(found, m.next_state[picked], states)
+        rewards = np.where(found, m.reward[picked], 0.0)
+        return next_states, rewards
+
+
+_SAMPLERS: "weakref.WeakKeyDictionary[MDP, BatchSampler]" = weakref.WeakKeyDictionary()
+
+
+def clear_batch_samplers(mdp: MDP | None = None) -> None:
+    """Forget cached batch samplers (call after changing an MDP's dynamics)."""
+    if mdp is None:
+        _SAMPLERS.clear()
+    else:
+        _SAMPLERS.pop(mdp, None)
+
+
+def batch_sampler(mdp: MDP | CompiledMDP) -> BatchSampler:
+    """Cached ``BatchSampler`` for an MDP (compiled on first use)."""
+    if isinstance(mdp, CompiledMDP):
+        return BatchSampler(mdp)
+    sampler = _SAMPLERS.get(mdp)
+    if sampler is None:
+        sampler = _SAMPLERS[mdp] = BatchSampler(as_compiled(mdp))
+    return sampler